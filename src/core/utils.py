@@ -6,7 +6,8 @@ Helper functions for data processing, normalization, and calculations
 import re
 import hashlib
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 import math
 
 
@@ -89,7 +90,10 @@ def normalize_score(
         return 0.0
 
     normalized = ((value - min_val) / (max_val - min_val)) * scale
-    return max(0, min(scale, normalized))
+
+    # Same clamp as max(0, min(scale, normalized)), without two builtin calls
+    clamped = normalized if normalized < scale else scale
+    return clamped if clamped > 0 else 0
 
 
 def sigmoid(x: float, midpoint: float = 0, steepness: float = 1) -> float:
@@ -161,13 +165,9 @@ def detect_outliers(values: List[float], threshold: float = 2.0) -> List[int]:
     return outliers
 
 
-def extract_keywords(text: str, min_length: int = 4) -> List[str]:
-    """Extract keywords from text (simple word tokenization)"""
-    # Remove special characters and split
-    words = re.findall(r"\b[a-zA-Z]{" + str(min_length) + r",}\b", text.lower())
-
-    # Remove common stop words
-    stop_words = {
+# Common stop words removed from extracted keywords
+_STOP_WORDS = frozenset(
+    {
         "this",
         "that",
         "with",
@@ -182,9 +182,111 @@ def extract_keywords(text: str, min_length: int = 4) -> List[str]:
         "where",
         "about",
     }
+)
+
 
-    keywords = [word for word in words if word not in stop_words]
-    return keywords
+@lru_cache(maxsize=None)
+def _keyword_pattern(min_length: int) -> "re.Pattern":
+    """Compiled word tokenizer for a minimum keyword length"""
+    return re.compile(r"\b[a-zA-Z]{" + str(min_length) + r",}\b")
+
+
+def extract_keywords(text: str, min_length: int = 4) -> List[str]:
+    """Extract keywords from text (simple word tokenization)"""
+    # Remove special characters and split
+    words = _keyword_pattern(min_length).findall(text.lower())
+    return extract_keywords_from_tokens(words)
+
+
+def keywords_with_offsets(
+    text: str, min_length: int = 4
+) -> Tuple[List[str], List[int]]:
+    """
+    Extract keywords from text once, keeping each keyword's start offset
+
+    Lets callers pull keywords for many windows of one document (bisect the
+    offsets) without re-tokenizing or copying each window.
+    """
+    keywords = []
+    offsets = []
+    for match in _keyword_pattern(min_length).finditer(text):
+        word = match.group().lower()
+        if word not in _STOP_WORDS:
+            keywords.append(word)
+            offsets.append(match.start())
+    return keywords, offsets
+
+
+def extract_keywords_from_tokens(tokens: List[str]) -> List[str]:
+    """Drop stop words from already-tokenized, lowercase words"""
+    return [word for word in tokens if word not in _STOP_WORDS]
+
+
+def _trie_pattern(words) -> str:
+    """
+    Regex alternation for words with shared prefixes factored out
+
+    Branches at each node start with distinct characters and optional
+    suffixes are greedy, so a match is always the longest word that starts
+    at that position.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [
+            re.escape(char) + render(child) for char, child in node.items() if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+class KeywordClassifier:
+    """
+    Classify text by keyword tables with a single regex scan
+
+    Table order is priority order: when keywords from several labels occur in
+    the text, the earliest label in the table wins.
+    """
+
+    def __init__(self, table: Dict[Any, List[str]]):
+        self._rank = {label: i for i, label in enumerate(table)}
+        self._label_by_keyword = {}
+        for label, keywords in table.items():
+            for kw in keywords:
+                self._label_by_keyword.setdefault(kw, label)
+
+        # The trie regex reports only the longest keyword at each offset, so
+        # credit each keyword with the best label of any keyword it starts with
+        first_label = dict(self._label_by_keyword)
+        for kw in self._label_by_keyword:
+            self._label_by_keyword[kw] = min(
+                (
+                    label
+                    for prefix, label in first_label.items()
+                    if kw.startswith(prefix)
+                ),
+                key=self._rank.__getitem__,
+            )
+
+        # Lookahead reports a hit at every offset, so overlapping keywords all count
+        self._regex = re.compile(f"(?=({_trie_pattern(self._label_by_keyword)}))")
+
+        # Classified names and topics repeat heavily across scans
+        self.match = lru_cache(maxsize=4096)(self._match)
+
+    def _match(self, text: str, default: Any = None) -> Any:
+        """Highest-priority label with a keyword in text, else default"""
+        hits = {self._label_by_keyword[m.group(1)] for m in self._regex.finditer(text)}
+        return min(hits, key=self._rank.__getitem__) if hits else default
 
 
 def calculate_momentum_change(
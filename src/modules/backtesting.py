@@ -3,14 +3,69 @@ Tech Momentum Arbitrage Engine - Backtesting Module
 Historical performance validation (Q4 2022 → Q4 2024)
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+from datetime import datetime
+from pathlib import Path
+from itertools import accumulate
+from typing import Dict
+import io
 import random
 
 from src.core.schemas import BacktestResult
 from src.core.utils import sharpe_ratio, max_drawdown
 
 
+# Resolved relative to the repo root so it works outside the original checkout
+_REPORT_DIR = Path(__file__).resolve().parents[2] / "outputs" / "reports"
+_REPORT_DIR_READY = False
+
+# ======================== REPORT TEMPLATES ========================
+
+_SUMMARY_TEMPLATE = "\n".join(
+    [
+        "# BACKTEST RESULTS (Q4 2022 → Q4 2024)",
+        "",
+        "## 📊 Performance Summary",
+        "",
+        "- **Total Return**: {total_return:.1f}%",
+        "- **Sharpe Ratio**: {sharpe_ratio:.2f}",
+        "- **Max Drawdown**: {max_drawdown:.1f}%",
+        "- **Alpha vs QQQ**: {alpha_vs_qqq:+.1f}%",
+        "- **Win Rate**: {win_rate:.1f}%",
+        "",
+        "## 🎯 Signal Accuracy",
+        "",
+        "- **IPO Prediction Accuracy**: {ipo_accuracy:.1f}%",
+        "- **Momentum Signal Accuracy**: {momentum_accuracy:.1f}%",
+        "",
+        "## 🏆 Best Signals",
+        "",
+        "",
+    ]
+)
+
+_INSIGHTS_SECTION = "\n".join(
+    [
+        "## 📈 Key Insights",
+        "",
+        "1. **Wave 1 Momentum Validated**: Companies solving fundamental infrastructure bottlenecks (NVDA, AVGO) significantly outperformed",
+        "2. **Divergence Detection Works**: SNOW flagged as bubble risk (high hype, slowing build) - declined 28%",
+        "3. **Second-Order Plays Effective**: ANET (datacenter networking) captured 148% returns as second-order AI play",
+        "4. **Moat Matters**: PLTR (Wave 3, strong moat) delivered 233% returns with lower volatility",
+        "5. **Timing Challenges**: SMCI shows importance of exit timing - reached 118 but gave back gains",
+        "",
+        "## 🔮 Forward-Looking Application",
+        "",
+        "**Current High-Conviction Plays (Nov 2025):**",
+        "",
+        "- **CoreWeave** - Similar setup to NVDA in 2022 (GPU infrastructure bottleneck)",
+        "- **Wiz** - Cybersecurity infrastructure like CRWD was in 2022",
+        "- **Databricks** - Data infrastructure with execution momentum",
+        "",
+        "**Expected Alpha**: If historical patterns hold, portfolio should generate 50-100% returns over 18-24 months with Sharpe > 1.0",
+    ]
+)
+
+
 class BacktestEngine:
     """
     Historical backtesting engine
@@ -71,6 +126,22 @@ class BacktestEngine:
         # Benchmark (QQQ)
         self.qqq_return = 0.42  # 42% return over period
 
+        # Simulated returns as a tickers x months matrix
+        # Simplified: every month carries the ticker's total period return, which
+        # is spread evenly over the 24 months when the columns are reduced.
+        # Additional tickers or strategies just append rows.
+        self.n_months = 24
+        self._ret_matrix = [
+            [v["return"]] * self.n_months
+            for v in self.historical_winners.values()
+        ]
+
+        # Lessons only depend on the static dataset - resolve once per ticker
+        self._lessons = {
+            ticker: self._generate_lesson(data)
+            for ticker, data in self.historical_winners.items()
+        }
+
     def run_backtest(self) -> BacktestResult:
         """
         Simulate Q4 2022 → Q4 2024 performance
@@ -81,27 +152,26 @@ class BacktestEngine:
 
         # Calculate portfolio returns (equal weight)
         winners = [v for k, v in self.historical_winners.items() if v["return"] > 0]
-        losers = [v for k, v in self.historical_winners.items() if v["return"] <= 0]
 
         # Equal weight portfolio
         returns = [v["return"] for v in self.historical_winners.values()]
         portfolio_return = sum(returns) / len(returns)
 
-        # Simulate monthly returns for Sharpe calculation
-        # Simplified: distribute total return across 24 months
-        monthly_returns = []
-        for i in range(24):
-            # Add some noise to simulate monthly variation
-            monthly_return = portfolio_return / 24 + random.uniform(-0.02, 0.02)
-            monthly_returns.append(monthly_return)
+        # Equal-weight portfolio return per month (column mean of the matrix,
+        # spread over the period), plus some noise to simulate monthly variation
+        n_tickers = len(self._ret_matrix)
+        monthly_returns = [
+            sum(month) / n_tickers / self.n_months + random.uniform(-0.02, 0.02)
+            for month in zip(*self._ret_matrix)
+        ]
 
         # Calculate Sharpe
         sharpe = sharpe_ratio(monthly_returns, risk_free_rate=0.04, periods_per_year=12)
 
         # Max drawdown (simulate)
-        cumulative = [100]
-        for r in monthly_returns:
-            cumulative.append(cumulative[-1] * (1 + r))
+        cumulative = list(
+            accumulate(monthly_returns, lambda equity, r: equity * (1 + r), initial=100)
+        )
         max_dd = max_drawdown(cumulative)
 
         # Alpha vs QQQ
@@ -110,9 +180,6 @@ class BacktestEngine:
         # Win rate
         win_rate = len(winners) / len(self.historical_winners)
 
-        # IPO prediction accuracy (simulated)
-        ipo_accuracy = 0.68  # 68% - predicting which late-stage companies would IPO
-
         # Momentum signal accuracy
         momentum_accuracy = len(winners) / len(self.historical_winners)
 
@@ -142,7 +209,8 @@ class BacktestEngine:
             max_drawdown=max_dd,
             alpha_vs_qqq=alpha,
             win_rate=win_rate,
-            ipo_prediction_accuracy=ipo_accuracy,
+            # Simulated: 68% of late-stage IPO calls were correct
+            ipo_prediction_accuracy=0.68,
             momentum_signal_accuracy=momentum_accuracy,
             best_signals=best_signals,
             worst_signals=worst_signals,
@@ -151,57 +219,37 @@ class BacktestEngine:
 
     def export_backtest_report(self, result: BacktestResult, filepath: str):
         """Export backtest results as markdown"""
-        md = []
-
-        md.append("# BACKTEST RESULTS (Q4 2022 → Q4 2024)")
-        md.append("")
-        md.append("## 📊 Performance Summary")
-        md.append("")
-        md.append(f"- **Total Return**: {result.total_return*100:.1f}%")
-        md.append(f"- **Sharpe Ratio**: {result.sharpe_ratio:.2f}")
-        md.append(f"- **Max Drawdown**: {result.max_drawdown:.1f}%")
-        md.append(f"- **Alpha vs QQQ**: {result.alpha_vs_qqq*100:+.1f}%")
-        md.append(f"- **Win Rate**: {result.win_rate*100:.1f}%")
-        md.append("")
-        md.append("## 🎯 Signal Accuracy")
-        md.append("")
-        md.append(f"- **IPO Prediction Accuracy**: {result.ipo_prediction_accuracy*100:.1f}%")
-        md.append(f"- **Momentum Signal Accuracy**: {result.momentum_signal_accuracy*100:.1f}%")
-        md.append("")
-        md.append("## 🏆 Best Signals")
-        md.append("")
+        # Scale percentages once; the template only formats
+        fields = {
+            "total_return": result.total_return * 100,
+            "sharpe_ratio": result.sharpe_ratio,
+            "max_drawdown": result.max_drawdown,
+            "alpha_vs_qqq": result.alpha_vs_qqq * 100,
+            "win_rate": result.win_rate * 100,
+            "ipo_accuracy": result.ipo_prediction_accuracy * 100,
+            "momentum_accuracy": result.momentum_signal_accuracy * 100,
+        }
+
+        buf = io.StringIO()
+        w = buf.write
+
+        w(_SUMMARY_TEMPLATE.format_map(fields))
         for signal in result.best_signals:
-            md.append(f"### {signal['ticker']}: {signal['return']*100:+.1f}%")
-            md.append(f"**Thesis:** {signal['thesis']}")
-            md.append("")
-        md.append("## ⚠️ Worst Signals")
-        md.append("")
+            w(f"### {signal['ticker']}: {signal['return']*100:+.1f}%\n")
+            w(f"**Thesis:** {signal['thesis']}\n")
+            w("\n")
+        w("## ⚠️ Worst Signals\n")
+        w("\n")
         for signal in result.worst_signals:
-            md.append(f"### {signal['ticker']}: {signal['return']*100:+.1f}%")
-            md.append(f"**Thesis:** {signal['thesis']}")
-            md.append(f"**Lesson:** {self._generate_lesson(signal)}")
-            md.append("")
-
-        md.append("## 📈 Key Insights")
-        md.append("")
-        md.append("1. **Wave 1 Momentum Validated**: Companies solving fundamental infrastructure bottlenecks (NVDA, AVGO) significantly outperformed")
-        md.append("2. **Divergence Detection Works**: SNOW flagged as bubble risk (high hype, slowing build) - declined 28%")
-        md.append("3. **Second-Order Plays Effective**: ANET (datacenter networking) captured 148% returns as second-order AI play")
-        md.append("4. **Moat Matters**: PLTR (Wave 3, strong moat) delivered 233% returns with lower volatility")
-        md.append("5. **Timing Challenges**: SMCI shows importance of exit timing - reached 118 but gave back gains")
-        md.append("")
-        md.append("## 🔮 Forward-Looking Application")
-        md.append("")
-        md.append("**Current High-Conviction Plays (Nov 2025):**")
-        md.append("")
-        md.append("- **CoreWeave** - Similar setup to NVDA in 2022 (GPU infrastructure bottleneck)")
-        md.append("- **Wiz** - Cybersecurity infrastructure like CRWD was in 2022")
-        md.append("- **Databricks** - Data infrastructure with execution momentum")
-        md.append("")
-        md.append("**Expected Alpha**: If historical patterns hold, portfolio should generate 50-100% returns over 18-24 months with Sharpe > 1.0")
+            lesson = self._lessons.get(signal["ticker"]) or self._generate_lesson(signal)
+            w(f"### {signal['ticker']}: {signal['return']*100:+.1f}%\n")
+            w(f"**Thesis:** {signal['thesis']}\n")
+            w(f"**Lesson:** {lesson}\n")
+            w("\n")
+        w(_INSIGHTS_SECTION)
 
         with open(filepath, "w") as f:
-            f.write("\n".join(md))
+            f.write(buf.getvalue())
 
         print(f"✅ Exported backtest report to {filepath}")
 
@@ -217,15 +265,17 @@ class BacktestEngine:
 
 def generate_backtest():
     """Generate and export backtest report"""
+    global _REPORT_DIR_READY
+
     engine = BacktestEngine()
     result = engine.run_backtest()
 
-    from pathlib import Path
-
-    output_dir = Path("/home/user/Tsunami/outputs/reports")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # Only create the output directory once per process
+    if not _REPORT_DIR_READY:
+        _REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        _REPORT_DIR_READY = True
 
-    engine.export_backtest_report(result, str(output_dir / "backtest_2022_2024.md"))
+    engine.export_backtest_report(result, str(_REPORT_DIR / "backtest_2022_2024.md"))
 
     return result
 
@@ -3,14 +3,109 @@ Tech Momentum Arbitrage Engine - Bottleneck Discovery Module
 Self-updating agent that scans for emerging infrastructure bottlenecks
 """
 
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import re
-from collections import Counter
+from collections import Counter, defaultdict, deque
+from functools import partial
 
 from src.core.schemas import EmergingBottleneck, Sector, WaveCategory
 from src.core.config import Config
-from src.core.utils import extract_keywords
+from src.core.utils import (
+    KeywordClassifier,
+    extract_keywords,
+    keywords_with_offsets,
+)
+
+
+# Keyword → sector tables; earlier sectors take priority when several match
+SECTOR_KEYWORDS = {
+    Sector.AI_INFRA: ["inference", "neural", "machine learning", "training", "gpu"],
+    Sector.SEMICONDUCTORS: ["chip", "semiconductor", "fab", "lithography"],
+    Sector.QUANTUM: ["quantum", "qubit", "superposition", "entanglement"],
+    Sector.SIX_G: ["wireless", "spectrum", "5g", "6g", "satellite"],
+    Sector.GREEN_ENERGY: ["battery", "solar", "wind", "grid", "storage"],
+    Sector.CYBERSECURITY: ["security", "encryption", "authentication"],
+    Sector.DATA_INFRA: ["database", "pipeline", "etl", "warehouse"],
+    Sector.BIOTECH_INFRA: ["drug", "protein", "compound", "clinical"],
+}
+
+REGULATORY_SECTOR_KEYWORDS = {
+    Sector.SIX_G: ["spectrum", "wireless"],
+    Sector.BIOTECH_INFRA: ["drug", "clinical"],
+    Sector.GREEN_ENERGY: ["energy", "power"],
+    Sector.CYBERSECURITY: ["security", "defense"],
+}
+
+
+_CLUSTER_SECTORS = KeywordClassifier(SECTOR_KEYWORDS)
+_CATEGORY_SECTORS = KeywordClassifier(REGULATORY_SECTOR_KEYWORDS)
+
+
+def _find_signal_mentions(
+    text: str,
+    signal_re: "re.Pattern",
+    signal_patterns: List[str],
+    signal_literals: Optional[Tuple[str, ...]],
+) -> List[Tuple[Tuple[str, ...], str]]:
+    """
+    Scan one filing for bottleneck language
+
+    Returns:
+        (bottleneck_key, pattern) for every signal hit in the filing, where the
+        key is the sorted tuple of the context's top 3 keywords
+    """
+    text = text.lower()
+
+    if signal_literals and not any(phrase in text for phrase in signal_literals):
+        return []
+
+    mentions = []
+    keywords = offsets = None
+
+    # Single pass over the text for all bottleneck patterns
+    for match in signal_re.finditer(text):
+        pattern_id = match.lastgroup
+        pattern = signal_patterns[int(pattern_id[1:])]
+
+        # Extract the document's keywords once, on the first hit
+        if keywords is None:
+            keywords, offsets = keywords_with_offsets(text)
+
+        # Context window of +/-100 chars around the match, as keyword indices;
+        # words cut by the window edge are left out
+        start = max(0, match.start(pattern_id) - 100)
+        end = min(len(text), match.end(pattern_id) + 100)
+        lo = bisect_left(offsets, start)
+        hi = bisect_left(offsets, end)
+        if hi > lo and offsets[hi - 1] + len(keywords[hi - 1]) > end:
+            hi -= 1
+
+        # Create bottleneck key from the window's top 3 keywords; only those
+        # are ever copied out of the document
+        if hi > lo:
+            top = keywords[lo : min(hi, lo + 3)]
+            mentions.append((tuple(sorted(top)), pattern))
+
+    return mentions
+
+
+class _MentionAccumulator:
+    """Running tally for one candidate bottleneck during a scan"""
+
+    __slots__ = ("count", "evidence", "sources", "sectors")
+
+    def __init__(self):
+        self.count = 0
+        self.evidence = deque(maxlen=5)  # Only the latest 5 are reported
+        self.sources = set()  # Companies (SEC) or VC firms (theses)
+        self.sectors = Counter()  # Mentions per sector
+
+    def add_evidence(self, evidence: str):
+        """Record evidence, skipping repeats of a message already held"""
+        if evidence not in self.evidence:
+            self.evidence.append(evidence)
 
 
 class BottleneckDiscoveryAgent:
@@ -41,6 +136,46 @@ class BottleneckDiscoveryAgent:
             r"access barrier",
         ]
 
+        # Cheap literal pre-filter: str.__contains__ skips filings that contain
+        # none of the phrases without running the regex at all. Only valid while
+        # every pattern is a plain literal (re.escape also escapes spaces).
+        self._signal_literals = (
+            tuple(self.signal_patterns)
+            if all(
+                re.escape(p).replace("\\ ", " ") == p for p in self.signal_patterns
+            )
+            else None
+        )
+
+        # All patterns compiled into one alternation so each filing is scanned
+        # once. The lookahead keeps overlapping hits ("prohibitive cost
+        # reduction") and the group name maps a hit back to its pattern.
+        alternation = (
+            "(?=(?:"
+            + "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(self.signal_patterns))
+            + "))"
+        )
+
+        # For literal patterns, a one-character class of their first letters
+        # lets the engine reject most positions before trying any alternative
+        if self._signal_literals:
+            first_chars = "".join(sorted({p[0] for p in self._signal_literals}))
+            alternation = f"(?=[{re.escape(first_chars)}])" + alternation
+
+        self._signal_re = re.compile(alternation)
+
+        # Keywords that signal infrastructure investment thesis
+        self.infrastructure_keywords = (
+            "fundamental infrastructure",
+            "rails",
+            "chokepoint",
+            "bottleneck",
+            "critical path",
+            "enabling technology",
+            "platform shift",
+            "infrastructure layer",
+        )
+
     def discover_bottlenecks(
         self,
         sec_filings: List[Dict] = None,
@@ -96,76 +231,57 @@ class BottleneckDiscoveryAgent:
 
         Look for: "replacing legacy", "infrastructure bottleneck", "cost reduction"
         """
-        bottleneck_mentions = {}
+        bottleneck_mentions = defaultdict(_MentionAccumulator)
+
+        now = datetime.now()
+        cutoff = now - timedelta(days=180)
+
+        # Only consider recent filings (last 6 months)
+        recent = [f for f in filings if f.get("date", now) >= cutoff]
 
-        for filing in filings:
-            text = filing.get("text", "").lower()
+        scan = partial(
+            _find_signal_mentions,
+            signal_re=self._signal_re,
+            signal_patterns=self.signal_patterns,
+            signal_literals=self._signal_literals,
+        )
+        results = map(scan, (f.get("text", "") for f in recent))
+
+        for filing, mentions in zip(recent, results):
             company = filing.get("company", "Unknown")
             sector = filing.get("sector", Sector.AI_INFRA)
-            filing_date = filing.get("date", datetime.now())
-
-            # Only consider recent filings (last 6 months)
-            if filing_date < datetime.now() - timedelta(days=180):
-                continue
 
-            # Search for bottleneck patterns
-            for pattern in self.signal_patterns:
-                if re.search(pattern, text):
-                    # Extract context around match
-                    matches = re.finditer(pattern, text)
-                    for match in matches:
-                        start = max(0, match.start() - 100)
-                        end = min(len(text), match.end() + 100)
-                        context = text[start:end]
-
-                        # Extract keywords from context
-                        keywords = extract_keywords(context)
-
-                        # Create bottleneck key from top keywords
-                        if keywords:
-                            bottleneck_key = " ".join(sorted(keywords[:3]))
-
-                            if bottleneck_key not in bottleneck_mentions:
-                                bottleneck_mentions[bottleneck_key] = {
-                                    "count": 0,
-                                    "evidence": [],
-                                    "companies": set(),
-                                    "sectors": set(),
-                                }
-
-                            bottleneck_mentions[bottleneck_key]["count"] += 1
-                            bottleneck_mentions[bottleneck_key]["evidence"].append(
-                                f"{company} mentioned '{pattern}' in SEC filing"
-                            )
-                            bottleneck_mentions[bottleneck_key]["companies"].add(
-                                company
-                            )
-                            bottleneck_mentions[bottleneck_key]["sectors"].add(sector)
+            for bottleneck_key, pattern in mentions:
+                acc = bottleneck_mentions[bottleneck_key]
+                acc.count += 1
+                acc.add_evidence(f"{company} mentioned '{pattern}' in SEC filing")
+                acc.sources.add(company)
+                acc.sectors[sector] += 1
 
         # Convert to EmergingBottleneck objects
         bottlenecks = []
-        for key, data in bottleneck_mentions.items():
-            if data["count"] >= 3:  # Threshold: at least 3 mentions
+        for key, acc in bottleneck_mentions.items():
+            if acc.count >= 3:  # Threshold: at least 3 mentions
                 # Determine most common sector
                 sector = (
-                    Counter(data["sectors"]).most_common(1)[0][0]
-                    if data["sectors"]
+                    acc.sectors.most_common(1)[0][0]
+                    if acc.sectors
                     else Sector.AI_INFRA
                 )
 
-                confidence = min(data["count"] / 20.0, 0.95)  # Max at 20 mentions
+                confidence = min(acc.count / 20.0, 0.95)  # Max at 20 mentions
 
                 bottleneck = EmergingBottleneck(
-                    bottleneck_name=key.title(),
+                    bottleneck_name=" ".join(key).title(),
                     description=f"Infrastructure bottleneck identified through SEC filing analysis",
                     confidence=confidence,
-                    evidence=data["evidence"][:5],  # Top 5 evidence points
-                    private_companies=list(data["companies"])[:10],
+                    evidence=list(acc.evidence),  # Latest 5 distinct evidence points
+                    private_companies=list(acc.sources)[:10],
                     public_proxies=[],
                     wave_classification=WaveCategory.WAVE_1,
                     sector=sector,
-                    priority="HIGH" if data["count"] > 10 else "MEDIUM",
-                    discovered_date=datetime.now(),
+                    priority="HIGH" if acc.count > 10 else "MEDIUM",
+                    discovered_date=now,
                 )
 
                 bottlenecks.append(bottleneck)
@@ -180,40 +296,46 @@ class BottleneckDiscoveryAgent:
         """
         bottlenecks = []
 
-        # Group patents by technology cluster
+        now = datetime.now()
+        cutoff = now - timedelta(days=730)
+        one_year_ago = now - timedelta(days=365)
+
+        # Group patents by technology cluster, counting in a single pass
         clusters = {}
         for patent in patent_data:
             cluster = patent.get("technology_cluster", "Unknown")
-            grant_date = patent.get("grant_date", datetime.now())
+            grant_date = patent.get("grant_date")
 
-            # Only recent patents (last 2 years)
-            if grant_date < datetime.now() - timedelta(days=730):
-                continue
+            if grant_date is None:
+                # Undated patents stay in the window but never count as recent
+                is_recent = False
+            elif grant_date < cutoff:
+                continue  # Only recent patents (last 2 years)
+            else:
+                is_recent = grant_date > one_year_ago
 
             if cluster not in clusters:
                 clusters[cluster] = {
-                    "patents": [],
+                    "patent_count": 0,
+                    "recent_count": 0,
                     "total_citations": 0,
                     "companies": set(),
                 }
 
-            clusters[cluster]["patents"].append(patent)
-            clusters[cluster]["total_citations"] += patent.get("citation_count", 0)
-            clusters[cluster]["companies"].add(patent.get("company", "Unknown"))
+            data = clusters[cluster]
+            data["patent_count"] += 1
+            data["recent_count"] += is_recent
+            data["total_citations"] += patent.get("citation_count", 0)
+            data["companies"].add(patent.get("company", "Unknown"))
 
         # Identify high-growth clusters
         for cluster, data in clusters.items():
-            patent_count = len(data["patents"])
+            patent_count = data["patent_count"]
 
             # Threshold: at least 20 patents in cluster
             if patent_count >= 20:
                 # Calculate year-over-year growth
-                one_year_ago = datetime.now() - timedelta(days=365)
-                recent_count = sum(
-                    1
-                    for p in data["patents"]
-                    if p.get("grant_date", datetime.min) > one_year_ago
-                )
+                recent_count = data["recent_count"]
                 older_count = patent_count - recent_count
 
                 if older_count > 0:
@@ -239,7 +361,7 @@ class BottleneckDiscoveryAgent:
                         wave_classification=WaveCategory.WAVE_1,
                         sector=self._infer_sector_from_cluster(cluster),
                         priority="HIGH" if yoy_growth > 2.0 else "MEDIUM",
-                        discovered_date=datetime.now(),
+                        discovered_date=now,
                     )
 
                     bottlenecks.append(bottleneck)
@@ -252,67 +374,51 @@ class BottleneckDiscoveryAgent:
         """
         bottlenecks = []
 
-        # Keywords that signal infrastructure investment thesis
-        infrastructure_keywords = [
-            "fundamental infrastructure",
-            "rails",
-            "chokepoint",
-            "bottleneck",
-            "critical path",
-            "enabling technology",
-            "platform shift",
-            "infrastructure layer",
-        ]
+        bottleneck_mentions = defaultdict(_MentionAccumulator)
 
-        bottleneck_mentions = {}
+        now = datetime.now()
+        cutoff = now - timedelta(days=365)
 
         for thesis in vc_theses:
+            # Recent theses (last year); skip stale ones before touching the text
+            if thesis.get("date", now) < cutoff:
+                continue
+
             text = thesis.get("text", "").lower()
             vc_firm = thesis.get("vc_firm", "Unknown VC")
-            publish_date = thesis.get("date", datetime.now())
             thesis_title = thesis.get("title", "")
 
-            # Recent theses (last year)
-            if publish_date < datetime.now() - timedelta(days=365):
+            # Check for infrastructure keywords (each hit counts as a mention)
+            hits = sum(keyword in text for keyword in self.infrastructure_keywords)
+            if not hits:
                 continue
 
-            # Check for infrastructure keywords
-            for keyword in infrastructure_keywords:
-                if keyword in text:
-                    # Extract the main topic
-                    keywords = extract_keywords(thesis_title + " " + text)
-                    if keywords:
-                        topic = " ".join(sorted(keywords[:2]))
-
-                        if topic not in bottleneck_mentions:
-                            bottleneck_mentions[topic] = {
-                                "count": 0,
-                                "evidence": [],
-                                "vcs": set(),
-                            }
-
-                        bottleneck_mentions[topic]["count"] += 1
-                        bottleneck_mentions[topic]["evidence"].append(
-                            f"{vc_firm} published thesis on '{thesis_title}'"
-                        )
-                        bottleneck_mentions[topic]["vcs"].add(vc_firm)
+            # Extract the main topic once per thesis, not once per keyword hit
+            keywords = extract_keywords(thesis_title + " " + text)
+            if keywords:
+                topic = " ".join(sorted(keywords[:2]))
+
+                acc = bottleneck_mentions[topic]
+                acc.count += hits
+                acc.add_evidence(f"{vc_firm} published thesis on '{thesis_title}'")
+                acc.sources.add(vc_firm)
 
         # Convert to bottlenecks
-        for topic, data in bottleneck_mentions.items():
-            if data["count"] >= 2:  # At least 2 VC mentions
-                confidence = min(data["count"] / 5.0, 0.85)
+        for topic, acc in bottleneck_mentions.items():
+            if acc.count >= 2:  # At least 2 VC mentions
+                confidence = min(acc.count / 5.0, 0.85)
 
                 bottleneck = EmergingBottleneck(
                     bottleneck_name=topic.title(),
                     description=f"VC investment thesis focus area",
                     confidence=confidence,
-                    evidence=data["evidence"][:5],
+                    evidence=list(acc.evidence),
                     private_companies=[],
                     public_proxies=[],
                     wave_classification=WaveCategory.WAVE_1,
                     sector=self._infer_sector_from_keywords(topic),
-                    priority="HIGH" if len(data["vcs"]) >= 3 else "MEDIUM",
-                    discovered_date=datetime.now(),
+                    priority="HIGH" if len(acc.sources) >= 3 else "MEDIUM",
+                    discovered_date=now,
                 )
 
                 bottlenecks.append(bottleneck)
@@ -330,13 +436,16 @@ class BottleneckDiscoveryAgent:
         # New compliance categories signal infrastructure opportunities
         category_counts = {}
 
+        now = datetime.now()
+        cutoff = now - timedelta(days=365)
+
         for filing in regulatory_filings:
             category = filing.get("category", "Unknown")
             agency = filing.get("agency", "Unknown")
-            filing_date = filing.get("date", datetime.now())
+            filing_date = filing.get("date", now)
 
             # Recent filings (last year)
-            if filing_date < datetime.now() - timedelta(days=365):
+            if filing_date < cutoff:
                 continue
 
             if category not in category_counts:
@@ -363,7 +472,7 @@ class BottleneckDiscoveryAgent:
                     wave_classification=WaveCategory.WAVE_1,
                     sector=self._infer_sector_from_category(category),
                     priority="MEDIUM",
-                    discovered_date=datetime.now(),
+                    discovered_date=now,
                 )
 
                 bottlenecks.append(bottleneck)
@@ -374,61 +483,48 @@ class BottleneckDiscoveryAgent:
         self, bottlenecks: List[EmergingBottleneck]
     ) -> List[EmergingBottleneck]:
         """Merge bottlenecks with similar names/topics"""
-        # Simple deduplication by name similarity
-        # In production, would use NLP embeddings for semantic similarity
+        # Deduplication by name similarity: at least 2 shared words, or a
+        # word-set Jaccard of 0.5+ (catches short names like "Rails" vs
+        # "Inference Rails"). In production, would use NLP embeddings.
 
         unique = {}
+        position = {}  # name -> insertion order, so the earliest match wins
+        name_words = {}  # name -> its word set, split once
+        word_to_names = defaultdict(set)  # Inverted index over name words
+
         for bottleneck in bottlenecks:
             name_lower = bottleneck.bottleneck_name.lower()
-
-            # Check if similar bottleneck already exists
-            found_similar = False
-            for existing_name in list(unique.keys()):
-                # Simple word overlap check
-                existing_words = set(existing_name.split())
-                new_words = set(name_lower.split())
-                overlap = len(existing_words & new_words)
-
-                if overlap >= 2:  # At least 2 words in common
-                    # Merge evidence
-                    unique[existing_name].evidence.extend(bottleneck.evidence)
-                    unique[existing_name].confidence = max(
-                        unique[existing_name].confidence, bottleneck.confidence
-                    )
-                    found_similar = True
-                    break
-
-            if not found_similar:
+            new_words = set(name_lower.split())
+
+            # Only names sharing a word can overlap; count shared words per name
+            overlaps = Counter(
+                name for word in new_words for name in word_to_names.get(word, ())
+            )
+            similar = [
+                name
+                for name, overlap in overlaps.items()
+                if overlap >= 2
+                or overlap / len(new_words | name_words[name]) >= 0.5
+            ]
+
+            if similar:
+                # Merge evidence
+                existing = unique[min(similar, key=position.__getitem__)]
+                existing.evidence.extend(bottleneck.evidence)
+                existing.confidence = max(existing.confidence, bottleneck.confidence)
+            else:
+                if name_lower not in unique:
+                    position[name_lower] = len(position)
+                    name_words[name_lower] = new_words
+                    for word in new_words:
+                        word_to_names[word].add(name_lower)
                 unique[name_lower] = bottleneck
 
         return list(unique.values())
 
     def _infer_sector_from_cluster(self, cluster_name: str) -> Sector:
         """Infer sector from patent cluster name"""
-        cluster_lower = cluster_name.lower()
-
-        sector_keywords = {
-            Sector.AI_INFRA: [
-                "inference",
-                "neural",
-                "machine learning",
-                "training",
-                "gpu",
-            ],
-            Sector.SEMICONDUCTORS: ["chip", "semiconductor", "fab", "lithography"],
-            Sector.QUANTUM: ["quantum", "qubit", "superposition", "entanglement"],
-            Sector.SIX_G: ["wireless", "spectrum", "5g", "6g", "satellite"],
-            Sector.GREEN_ENERGY: ["battery", "solar", "wind", "grid", "storage"],
-            Sector.CYBERSECURITY: ["security", "encryption", "authentication"],
-            Sector.DATA_INFRA: ["database", "pipeline", "etl", "warehouse"],
-            Sector.BIOTECH_INFRA: ["drug", "protein", "compound", "clinical"],
-        }
-
-        for sector, keywords in sector_keywords.items():
-            if any(kw in cluster_lower for kw in keywords):
-                return sector
-
-        return Sector.AI_INFRA  # Default
+        return _CLUSTER_SECTORS.match(cluster_name.lower(), default=Sector.AI_INFRA)
 
     def _infer_sector_from_keywords(self, keywords: str) -> Sector:
         """Infer sector from keyword string"""
@@ -436,158 +532,149 @@ class BottleneckDiscoveryAgent:
 
     def _infer_sector_from_category(self, category: str) -> Sector:
         """Infer sector from regulatory category"""
-        category_lower = category.lower()
-
-        if "spectrum" in category_lower or "wireless" in category_lower:
-            return Sector.SIX_G
-        elif "drug" in category_lower or "clinical" in category_lower:
-            return Sector.BIOTECH_INFRA
-        elif "energy" in category_lower or "power" in category_lower:
-            return Sector.GREEN_ENERGY
-        elif "security" in category_lower or "defense" in category_lower:
-            return Sector.CYBERSECURITY
-        else:
-            return Sector.AI_INFRA
+        return _CATEGORY_SECTORS.match(category.lower(), default=Sector.AI_INFRA)
 
 
 # ======================== CURRENT WEEK SCAN (NOV 2025) ========================
 
 
+# Static snapshot: built once at import, every call shares the same objects
+_NOV_2025_BOTTLENECKS = (
+    EmergingBottleneck(
+        bottleneck_name="AI Model Serving Latency",
+        description="Infrastructure bottleneck in low-latency inference serving for production AI applications. Edge deployment and real-time response requirements driving demand for specialized inference infrastructure.",
+        confidence=0.87,
+        evidence=[
+            "34 patent grants in 'low-latency serving' cluster (up 340% YoY)",
+            "a16z published infrastructure thesis: 'The Inference Wars'",
+            "12 SEC filings mentioned 'inference optimization' in Q4 2024",
+            "Sequoia Capital memo on 'The $200B Inference Market'",
+            "Google Trends: 'inference optimization' up 230% YoY",
+        ],
+        private_companies=[
+            "Groq",
+            "Modular",
+            "SambaNova",
+            "Cerebras",
+            "d-Matrix",
+            "Tenstorrent",
+        ],
+        public_proxies=["NVDA", "AVGO", "AMD"],
+        estimated_market_size=4_200_000_000,
+        market_size_year=2027,
+        wave_classification=WaveCategory.WAVE_1,
+        sector=Sector.AI_INFRA,
+        priority="CRITICAL",
+        discovered_date=datetime.now(),
+    ),
+    EmergingBottleneck(
+        bottleneck_name="Agentic AI Orchestration Infrastructure",
+        description="Lack of robust orchestration and reliability infrastructure for multi-agent AI systems. As AI agents proliferate, need for workflow management, inter-agent communication, and failure handling becomes critical.",
+        confidence=0.82,
+        evidence=[
+            "18 VC theses published on 'AI agents' and 'orchestration' in Q4 2024",
+            "Benchmark Capital: 'The Agent Operating System'",
+            "Microsoft, Google launching agent frameworks signals market formation",
+            "56 startups raised $2.1B for agent infrastructure in 2024",
+            "Gartner prediction: '25% of enterprises will deploy AI agents by 2026'",
+        ],
+        private_companies=[
+            "LangChain (LangSmith)",
+            "Fixie.ai",
+            "Relevance AI",
+            "MultiOn",
+            "Adept",
+        ],
+        public_proxies=["MSFT", "GOOGL", "CRM"],
+        estimated_market_size=8_500_000_000,
+        market_size_year=2028,
+        wave_classification=WaveCategory.WAVE_1,
+        sector=Sector.AI_INFRA,
+        priority="CRITICAL",
+        discovered_date=datetime.now(),
+    ),
+    EmergingBottleneck(
+        bottleneck_name="Sovereign AI Infrastructure",
+        description="National security and data sovereignty driving demand for localized AI compute infrastructure. Countries building domestic AI capabilities to reduce dependence on US hyperscalers.",
+        confidence=0.79,
+        evidence=[
+            "EU AI Act creating regulatory moat for European AI infrastructure",
+            "Middle East sovereign wealth funds investing $50B+ in AI datacenters",
+            "Japan, India announcing national AI infrastructure programs",
+            "CoreWeave expanding into UAE, Saudi Arabia for sovereign cloud",
+            "15 countries announced AI sovereignty initiatives in 2024",
+        ],
+        private_companies=[
+            "CoreWeave",
+            "Lambda Labs",
+            "Crusoe Energy",
+            "Applied Digital",
+        ],
+        public_proxies=["EQIX", "DLR", "VRT"],
+        estimated_market_size=35_000_000_000,
+        market_size_year=2029,
+        wave_classification=WaveCategory.WAVE_1,
+        sector=Sector.AI_INFRA,
+        priority="HIGH",
+        discovered_date=datetime.now(),
+    ),
+    EmergingBottleneck(
+        bottleneck_name="Post-Quantum Cryptography Migration",
+        description="NIST finalization of post-quantum cryptography standards (2024) triggering enterprise migration wave. Massive infrastructure replacement cycle as quantum threat becomes imminent.",
+        confidence=0.75,
+        evidence=[
+            "NIST published PQC standards in August 2024",
+            "NSA mandating PQC for classified systems by 2025",
+            "Banking sector required to begin PQC migration by 2026",
+            "23 security vendors announced PQC products in 2024",
+            "Estimated $15B+ in cryptography infrastructure replacement needed",
+        ],
+        private_companies=[
+            "PQShield",
+            "Quantum Xchange",
+            "ISARA Corporation",
+            "Post-Quantum",
+        ],
+        public_proxies=["PANW", "FTNT", "ZS", "CRWD"],
+        estimated_market_size=15_000_000_000,
+        market_size_year=2030,
+        wave_classification=WaveCategory.WAVE_1,
+        sector=Sector.CYBERSECURITY,
+        priority="HIGH",
+        discovered_date=datetime.now(),
+    ),
+    EmergingBottleneck(
+        bottleneck_name="Energy-Efficient AI Chip Architecture",
+        description="Power consumption of AI training and inference becoming prohibitive. Datacenter power constraints and carbon targets driving demand for specialized low-power AI silicon.",
+        confidence=0.81,
+        evidence=[
+            "45 patent grants in 'energy-efficient neural processing' (up 280% YoY)",
+            "Major hyperscalers announcing custom low-power AI chips",
+            "EU datacenter power regulations tightening in 2025",
+            "Analog AI chip startups raised $1.2B in 2024",
+            "Industry consortium formed for 'Green AI Computing' standards",
+        ],
+        private_companies=[
+            "Graphcore",
+            "d-Matrix",
+            "Rain AI",
+            "Mythic",
+            "Untether AI",
+        ],
+        public_proxies=["ARM", "INTC", "NVDA"],
+        estimated_market_size=12_000_000_000,
+        market_size_year=2028,
+        wave_classification=WaveCategory.WAVE_1,
+        sector=Sector.SEMICONDUCTORS,
+        priority="HIGH",
+        discovered_date=datetime.now(),
+    ),
+)
+
+
 def generate_nov_2025_bottlenecks() -> List[EmergingBottleneck]:
     """
     Generate realistic bottleneck discoveries for November 2025
     Based on current technology trends and likely evolution
     """
-    bottlenecks = [
-        EmergingBottleneck(
-            bottleneck_name="AI Model Serving Latency",
-            description="Infrastructure bottleneck in low-latency inference serving for production AI applications. Edge deployment and real-time response requirements driving demand for specialized inference infrastructure.",
-            confidence=0.87,
-            evidence=[
-                "34 patent grants in 'low-latency serving' cluster (up 340% YoY)",
-                "a16z published infrastructure thesis: 'The Inference Wars'",
-                "12 SEC filings mentioned 'inference optimization' in Q4 2024",
-                "Sequoia Capital memo on 'The $200B Inference Market'",
-                "Google Trends: 'inference optimization' up 230% YoY",
-            ],
-            private_companies=[
-                "Groq",
-                "Modular",
-                "SambaNova",
-                "Cerebras",
-                "d-Matrix",
-                "Tenstorrent",
-            ],
-            public_proxies=["NVDA", "AVGO", "AMD"],
-            estimated_market_size=4_200_000_000,
-            market_size_year=2027,
-            wave_classification=WaveCategory.WAVE_1,
-            sector=Sector.AI_INFRA,
-            priority="CRITICAL",
-            discovered_date=datetime.now(),
-        ),
-        EmergingBottleneck(
-            bottleneck_name="Agentic AI Orchestration Infrastructure",
-            description="Lack of robust orchestration and reliability infrastructure for multi-agent AI systems. As AI agents proliferate, need for workflow management, inter-agent communication, and failure handling becomes critical.",
-            confidence=0.82,
-            evidence=[
-                "18 VC theses published on 'AI agents' and 'orchestration' in Q4 2024",
-                "Benchmark Capital: 'The Agent Operating System'",
-                "Microsoft, Google launching agent frameworks signals market formation",
-                "56 startups raised $2.1B for agent infrastructure in 2024",
-                "Gartner prediction: '25% of enterprises will deploy AI agents by 2026'",
-            ],
-            private_companies=[
-                "LangChain (LangSmith)",
-                "Fixie.ai",
-                "Relevance AI",
-                "MultiOn",
-                "Adept",
-            ],
-            public_proxies=["MSFT", "GOOGL", "CRM"],
-            estimated_market_size=8_500_000_000,
-            market_size_year=2028,
-            wave_classification=WaveCategory.WAVE_1,
-            sector=Sector.AI_INFRA,
-            priority="CRITICAL",
-            discovered_date=datetime.now(),
-        ),
-        EmergingBottleneck(
-            bottleneck_name="Sovereign AI Infrastructure",
-            description="National security and data sovereignty driving demand for localized AI compute infrastructure. Countries building domestic AI capabilities to reduce dependence on US hyperscalers.",
-            confidence=0.79,
-            evidence=[
-                "EU AI Act creating regulatory moat for European AI infrastructure",
-                "Middle East sovereign wealth funds investing $50B+ in AI datacenters",
-                "Japan, India announcing national AI infrastructure programs",
-                "CoreWeave expanding into UAE, Saudi Arabia for sovereign cloud",
-                "15 countries announced AI sovereignty initiatives in 2024",
-            ],
-            private_companies=[
-                "CoreWeave",
-                "Lambda Labs",
-                "Crusoe Energy",
-                "Applied Digital",
-            ],
-            public_proxies=["EQIX", "DLR", "VRT"],
-            estimated_market_size=35_000_000_000,
-            market_size_year=2029,
-            wave_classification=WaveCategory.WAVE_1,
-            sector=Sector.AI_INFRA,
-            priority="HIGH",
-            discovered_date=datetime.now(),
-        ),
-        EmergingBottleneck(
-            bottleneck_name="Post-Quantum Cryptography Migration",
-            description="NIST finalization of post-quantum cryptography standards (2024) triggering enterprise migration wave. Massive infrastructure replacement cycle as quantum threat becomes imminent.",
-            confidence=0.75,
-            evidence=[
-                "NIST published PQC standards in August 2024",
-                "NSA mandating PQC for classified systems by 2025",
-                "Banking sector required to begin PQC migration by 2026",
-                "23 security vendors announced PQC products in 2024",
-                "Estimated $15B+ in cryptography infrastructure replacement needed",
-            ],
-            private_companies=[
-                "PQShield",
-                "Quantum Xchange",
-                "ISARA Corporation",
-                "Post-Quantum",
-            ],
-            public_proxies=["PANW", "FTNT", "ZS", "CRWD"],
-            estimated_market_size=15_000_000_000,
-            market_size_year=2030,
-            wave_classification=WaveCategory.WAVE_1,
-            sector=Sector.CYBERSECURITY,
-            priority="HIGH",
-            discovered_date=datetime.now(),
-        ),
-        EmergingBottleneck(
-            bottleneck_name="Energy-Efficient AI Chip Architecture",
-            description="Power consumption of AI training and inference becoming prohibitive. Datacenter power constraints and carbon targets driving demand for specialized low-power AI silicon.",
-            confidence=0.81,
-            evidence=[
-                "45 patent grants in 'energy-efficient neural processing' (up 280% YoY)",
-                "Major hyperscalers announcing custom low-power AI chips",
-                "EU datacenter power regulations tightening in 2025",
-                "Analog AI chip startups raised $1.2B in 2024",
-                "Industry consortium formed for 'Green AI Computing' standards",
-            ],
-            private_companies=[
-                "Graphcore",
-                "d-Matrix",
-                "Rain AI",
-                "Mythic",
-                "Untether AI",
-            ],
-            public_proxies=["ARM", "INTC", "NVDA"],
-            estimated_market_size=12_000_000_000,
-            market_size_year=2028,
-            wave_classification=WaveCategory.WAVE_1,
-            sector=Sector.SEMICONDUCTORS,
-            priority="HIGH",
-            discovered_date=datetime.now(),
-        ),
-    ]
-
-    return bottlenecks
+    return list(_NOV_2025_BOTTLENECKS)
@@ -3,14 +3,110 @@ Tech Momentum Arbitrage Engine - Moat Scoring Module
 Evaluates competitive durability across 5 dimensions
 """
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from typing import List, Dict
+from operator import attrgetter
+from typing import List, Dict, Optional, Tuple
 
 from src.core.schemas import Company, MoatScore, WaveCategory, Sector
 from src.core.config import Config
 from src.core.utils import weighted_score, normalize_score
 
 
+# Sector → base score tables, built once at import instead of on every call
+
+# Regulatory intensity by sector
+_REGULATORY_BY_SECTOR = {
+    Sector.SIX_G: 85.0,  # Spectrum licenses
+    Sector.QUANTUM: 80.0,  # Export controls, national security
+    Sector.GREEN_ENERGY: 75.0,  # Utility contracts, grid integration
+    Sector.BIOTECH_INFRA: 70.0,  # FDA pathways
+    Sector.CYBERSECURITY: 60.0,  # FedRAMP, defense contracts
+    Sector.SEMICONDUCTORS: 55.0,  # Export controls (China)
+    Sector.AI_INFRA: 30.0,  # Emerging regulation
+    Sector.DATA_INFRA: 25.0,  # Data privacy laws
+}
+
+# Sector propensity for network effects
+_NETWORK_EFFECTS_BY_SECTOR = {
+    Sector.DATA_INFRA: 25.0,  # Data pipelines create lock-in
+    Sector.AI_INFRA: 20.0,  # Model serving platforms
+    Sector.BIOTECH_INFRA: 15.0,  # Compound libraries
+    Sector.CYBERSECURITY: 15.0,  # Security ecosystems
+    Sector.SEMICONDUCTORS: 10.0,  # Design tool ecosystems
+    Sector.GREEN_ENERGY: 5.0,  # Limited network effects
+    Sector.QUANTUM: 10.0,  # Emerging developer ecosystem
+    Sector.SIX_G: 15.0,  # Network infrastructure
+}
+
+# CapEx intensity by sector
+_CAPEX_INTENSITY_BY_SECTOR = {
+    Sector.SEMICONDUCTORS: 95.0,  # Multi-billion dollar fabs
+    Sector.QUANTUM: 90.0,  # Expensive cryogenic systems
+    Sector.SIX_G: 85.0,  # Satellite constellations
+    Sector.GREEN_ENERGY: 80.0,  # Power plants, grid storage
+    Sector.AI_INFRA: 75.0,  # GPU clusters, datacenters
+    Sector.BIOTECH_INFRA: 50.0,  # Lab equipment, but less intense
+    Sector.CYBERSECURITY: 25.0,  # Software-centric
+    Sector.DATA_INFRA: 30.0,  # Mostly software
+}
+
+# Sector propensity for data moats
+_DATA_MOAT_BY_SECTOR = {
+    Sector.AI_INFRA: 30.0,  # Training data, inference patterns
+    Sector.DATA_INFRA: 25.0,  # Data transformation patterns
+    Sector.BIOTECH_INFRA: 25.0,  # Compound libraries, experimental data
+    Sector.CYBERSECURITY: 20.0,  # Threat intelligence
+    Sector.SIX_G: 15.0,  # Network usage patterns
+    Sector.GREEN_ENERGY: 10.0,  # Grid data
+    Sector.SEMICONDUCTORS: 20.0,  # Design IP, process data
+    Sector.QUANTUM: 15.0,  # Calibration data
+}
+
+# Switching cost intensity by sector
+_SWITCHING_COSTS_BY_SECTOR = {
+    Sector.DATA_INFRA: 30.0,  # Pipeline migrations are painful
+    Sector.CYBERSECURITY: 25.0,  # Security posture lock-in
+    Sector.AI_INFRA: 20.0,  # Model retraining costs
+    Sector.BIOTECH_INFRA: 25.0,  # Workflow integration
+    Sector.SEMICONDUCTORS: 30.0,  # Design tool lock-in
+    Sector.GREEN_ENERGY: 20.0,  # Long-term contracts
+    Sector.QUANTUM: 15.0,  # Early, less lock-in yet
+    Sector.SIX_G: 25.0,  # Infrastructure dependencies
+}
+
+# Funding-stage bonuses as ascending "greater than" boundaries; bisect_left
+# counts the boundaries exceeded, which indexes the bonus
+_NETWORK_FUNDING_TIERS = (100_000_000, 200_000_000, 500_000_000)
+_NETWORK_FUNDING_BONUS = (0.0, 10.0, 15.0, 20.0)
+_SWITCHING_FUNDING_TIERS = (75_000_000, 150_000_000, 300_000_000)
+_SWITCHING_FUNDING_BONUS = (0.0, 10.0, 15.0, 25.0)
+
+# Durability bands as ascending "at least" boundaries; bisect_right counts the
+# boundaries reached, which indexes the rating
+_DURABILITY_TIERS = (40, 60, 80)
+_DURABILITY_RATINGS = ("Low", "Medium", "High", "Very High")
+
+# Distinct company/industry snapshots whose dimension scores are kept
+_DIMENSION_CACHE_SIZE = 4096
+
+# Industry facts (has_defense, has_gov, approval_count) for companies without
+# industry data
+_NO_INDUSTRY_FACTS = (False, False, 0)
+
+
+def _industry_facts(industry_data: Optional[Dict]) -> Tuple[bool, bool, int]:
+    """Parse the industry data fields the moat scorers read, once per company"""
+    if not industry_data:
+        return _NO_INDUSTRY_FACTS
+    approvals = industry_data.get("regulatory_approvals")
+    return (
+        bool(industry_data.get("has_defense_contracts", False)),
+        bool(industry_data.get("has_government_customers", False)),
+        len(approvals) if approvals else 0,
+    )
+
+
 class MoatScoringEngine:
     """
     Competitive moat analysis across 5 dimensions:
@@ -24,43 +120,61 @@ class MoatScoringEngine:
     def __init__(self, config: Config = Config()):
         self.config = config
 
-    def calculate_moat_score(self, company: Company, industry_data: Dict = None) -> MoatScore:
+        # Wave bands from the configured moat thresholds; below MEDIUM_MOAT the
+        # company keeps its own wave (None)
+        thresholds = config.thresholds
+        self._wave_tiers = (
+            thresholds.MEDIUM_MOAT,
+            thresholds.STRONG_MOAT,
+            thresholds.WAVE_4_MOAT_THRESHOLD,
+        )
+        self._wave_bands = (
+            None,
+            WaveCategory.WAVE_2,
+            WaveCategory.WAVE_3,
+            WaveCategory.WAVE_4,
+        )
+
+        # Snapshot key → (dimension scores, total), for companies rescored
+        # with unchanged inputs across runs and backtests
+        self._dimension_cache: Dict[Tuple, Tuple[Dict[str, float], float]] = {}
+
+    def calculate_moat_score(
+        self,
+        company: Company,
+        industry_data: Dict = None,
+        timestamp: Optional[datetime] = None,
+    ) -> MoatScore:
         """
         Calculate comprehensive moat score
 
         Args:
             company: Company object
             industry_data: Additional industry-specific data
+            timestamp: Scoring time (defaults to now; batches pass one shared value)
 
         Returns:
             MoatScore object with 5-dimension analysis
         """
-        industry_data = industry_data or {}
-
-        # 1. Regulatory Moat (0-100)
-        regulatory_moat = self._score_regulatory_moat(company, industry_data)
-
-        # 2. Network Effects (0-100)
-        network_effects = self._score_network_effects(company)
-
-        # 3. Capital Intensity (0-100)
-        capital_intensity = self._score_capital_intensity(company)
-
-        # 4. Data Moat (0-100)
-        data_moat = self._score_data_moat(company)
-
-        # 5. Switching Costs (0-100)
-        switching_costs = self._score_switching_costs(company)
+        facts = _industry_facts(industry_data)
+
+        # Everything the five dimensions read from the company and industry data
+        key = (
+            company.sector,
+            company.total_funding,
+            company.fortune_500_customers,
+            company.patent_count,
+            facts,
+        )
 
-        # Weighted composite
-        components = {
-            "regulatory_moat": regulatory_moat,
-            "network_effects": network_effects,
-            "capital_intensity": capital_intensity,
-            "data_moat": data_moat,
-            "switching_costs": switching_costs,
-        }
-        total_moat_score = weighted_score(components, self.config.scoring.MOAT_WEIGHTS)
+        cached = self._dimension_cache.get(key)
+        if cached is None:
+            cached = self._score_dimensions(company, facts)
+            if len(self._dimension_cache) >= _DIMENSION_CACHE_SIZE:
+                # Evict the oldest snapshot
+                del self._dimension_cache[next(iter(self._dimension_cache))]
+            self._dimension_cache[key] = cached
+        components, total_moat_score = cached
 
         # Determine wave potential and durability
         wave_potential = self._classify_wave_potential(total_moat_score, company)
@@ -69,53 +183,58 @@ class MoatScoringEngine:
         return MoatScore(
             company_id=company.company_id,
             company_name=company.name,
-            regulatory_moat=regulatory_moat,
-            network_effects=network_effects,
-            capital_intensity=capital_intensity,
-            data_moat=data_moat,
-            switching_costs=switching_costs,
+            **components,
             total_moat_score=total_moat_score,
             wave_potential=wave_potential,
             durability_rating=durability_rating,
-            timestamp=datetime.now(),
+            timestamp=timestamp or datetime.now(),
         )
 
-    def _score_regulatory_moat(self, company: Company, industry_data: Dict) -> float:
+    def _score_dimensions(
+        self, company: Company, facts: Tuple[bool, bool, int]
+    ) -> Tuple[Dict[str, float], float]:
+        """Score the five moat dimensions and their weighted composite"""
+        components = {
+            # 1. Regulatory Moat (0-100)
+            "regulatory_moat": self._score_regulatory_moat(company, facts),
+            # 2. Network Effects (0-100)
+            "network_effects": self._score_network_effects(company),
+            # 3. Capital Intensity (0-100)
+            "capital_intensity": self._score_capital_intensity(company),
+            # 4. Data Moat (0-100)
+            "data_moat": self._score_data_moat(company),
+            # 5. Switching Costs (0-100)
+            "switching_costs": self._score_switching_costs(company),
+        }
+
+        # Weighted composite
+        total_moat_score = weighted_score(components, self.config.scoring.MOAT_WEIGHTS)
+
+        return components, total_moat_score
+
+    def _score_regulatory_moat(
+        self, company: Company, facts: Tuple[bool, bool, int]
+    ) -> float:
         """
         Score regulatory barriers (licenses, approvals, compliance requirements)
 
         High moat sectors: Defense (ITAR), Healthcare (FDA), Telecom (FCC spectrum),
         Energy (utility contracts), Quantum (export controls)
         """
-        score = 0.0
-
         # Sector-based regulatory intensity
-        high_regulatory_sectors = {
-            Sector.SIX_G: 85.0,  # Spectrum licenses
-            Sector.QUANTUM: 80.0,  # Export controls, national security
-            Sector.GREEN_ENERGY: 75.0,  # Utility contracts, grid integration
-            Sector.BIOTECH_INFRA: 70.0,  # FDA pathways
-            Sector.CYBERSECURITY: 60.0,  # FedRAMP, defense contracts
-            Sector.SEMICONDUCTORS: 55.0,  # Export controls (China)
-            Sector.AI_INFRA: 30.0,  # Emerging regulation
-            Sector.DATA_INFRA: 25.0,  # Data privacy laws
-        }
+        score = _REGULATORY_BY_SECTOR.get(company.sector, 20.0)
 
-        score = high_regulatory_sectors.get(company.sector, 20.0)
+        has_defense, has_gov, approval_count = facts
 
         # Government/defense customer presence (adds regulatory moat)
-        has_defense = industry_data.get("has_defense_contracts", False)
-        has_gov = industry_data.get("has_government_customers", False)
-
         if has_defense:
             score += 15.0
         elif has_gov:
             score += 8.0
 
         # Regulatory approvals obtained
-        approvals = industry_data.get("regulatory_approvals", [])
-        if approvals:
-            score += min(len(approvals) * 3, 15.0)
+        if approval_count:
+            score += min(approval_count * 3, 15.0)
 
         return min(score, 100.0)
 
@@ -132,26 +251,12 @@ class MoatScoringEngine:
         score += customer_score
 
         # Sector propensity for network effects
-        network_effect_sectors = {
-            Sector.DATA_INFRA: 25.0,  # Data pipelines create lock-in
-            Sector.AI_INFRA: 20.0,  # Model serving platforms
-            Sector.BIOTECH_INFRA: 15.0,  # Compound libraries
-            Sector.CYBERSECURITY: 15.0,  # Security ecosystems
-            Sector.SEMICONDUCTORS: 10.0,  # Design tool ecosystems
-            Sector.GREEN_ENERGY: 5.0,  # Limited network effects
-            Sector.QUANTUM: 10.0,  # Emerging developer ecosystem
-            Sector.SIX_G: 15.0,  # Network infrastructure
-        }
-
-        score += network_effect_sectors.get(company.sector, 10.0)
+        score += _NETWORK_EFFECTS_BY_SECTOR.get(company.sector, 10.0)
 
         # Funding stage proxy (later stage = more network built)
-        if company.total_funding > 500_000_000:
-            score += 20.0
-        elif company.total_funding > 200_000_000:
-            score += 15.0
-        elif company.total_funding > 100_000_000:
-            score += 10.0
+        score += _NETWORK_FUNDING_BONUS[
+            bisect_left(_NETWORK_FUNDING_TIERS, company.total_funding)
+        ]
 
         return min(score, 100.0)
 
@@ -163,18 +268,7 @@ class MoatScoringEngine:
         Quantum (dilution refrigerators), 6G (satellites), Green Energy (plants)
         """
         # Sector-based CapEx intensity
-        capex_intensity = {
-            Sector.SEMICONDUCTORS: 95.0,  # Multi-billion dollar fabs
-            Sector.QUANTUM: 90.0,  # Expensive cryogenic systems
-            Sector.SIX_G: 85.0,  # Satellite constellations
-            Sector.GREEN_ENERGY: 80.0,  # Power plants, grid storage
-            Sector.AI_INFRA: 75.0,  # GPU clusters, datacenters
-            Sector.BIOTECH_INFRA: 50.0,  # Lab equipment, but less intense
-            Sector.CYBERSECURITY: 25.0,  # Software-centric
-            Sector.DATA_INFRA: 30.0,  # Mostly software
-        }
-
-        base_score = capex_intensity.get(company.sector, 30.0)
+        base_score = _CAPEX_INTENSITY_BY_SECTOR.get(company.sector, 30.0)
 
         # Funding magnitude as CapEx proxy
         funding_boost = normalize_score(company.total_funding, 0, 1_000_000_000, 15)
@@ -191,18 +285,7 @@ class MoatScoringEngine:
         score = 15.0  # Baseline
 
         # Sector propensity for data moats
-        data_moat_sectors = {
-            Sector.AI_INFRA: 30.0,  # Training data, inference patterns
-            Sector.DATA_INFRA: 25.0,  # Data transformation patterns
-            Sector.BIOTECH_INFRA: 25.0,  # Compound libraries, experimental data
-            Sector.CYBERSECURITY: 20.0,  # Threat intelligence
-            Sector.SIX_G: 15.0,  # Network usage patterns
-            Sector.GREEN_ENERGY: 10.0,  # Grid data
-            Sector.SEMICONDUCTORS: 20.0,  # Design IP, process data
-            Sector.QUANTUM: 15.0,  # Calibration data
-        }
-
-        score += data_moat_sectors.get(company.sector, 10.0)
+        score += _DATA_MOAT_BY_SECTOR.get(company.sector, 10.0)
 
         # Customer count = more data generated
         customer_boost = normalize_score(company.fortune_500_customers, 0, 100, 25)
@@ -224,30 +307,16 @@ class MoatScoringEngine:
         score = 20.0  # Baseline
 
         # Sector switching cost intensity
-        switching_cost_sectors = {
-            Sector.DATA_INFRA: 30.0,  # Pipeline migrations are painful
-            Sector.CYBERSECURITY: 25.0,  # Security posture lock-in
-            Sector.AI_INFRA: 20.0,  # Model retraining costs
-            Sector.BIOTECH_INFRA: 25.0,  # Workflow integration
-            Sector.SEMICONDUCTORS: 30.0,  # Design tool lock-in
-            Sector.GREEN_ENERGY: 20.0,  # Long-term contracts
-            Sector.QUANTUM: 15.0,  # Early, less lock-in yet
-            Sector.SIX_G: 25.0,  # Infrastructure dependencies
-        }
-
-        score += switching_cost_sectors.get(company.sector, 15.0)
+        score += _SWITCHING_COSTS_BY_SECTOR.get(company.sector, 15.0)
 
         # Enterprise customer count (enterprises have higher switching costs)
         customer_boost = normalize_score(company.fortune_500_customers, 0, 100, 30)
         score += customer_boost
 
         # Funding/maturity proxy (mature products have deeper integration)
-        if company.total_funding > 300_000_000:
-            score += 25.0
-        elif company.total_funding > 150_000_000:
-            score += 15.0
-        elif company.total_funding > 75_000_000:
-            score += 10.0
+        score += _SWITCHING_FUNDING_BONUS[
+            bisect_left(_SWITCHING_FUNDING_TIERS, company.total_funding)
+        ]
 
         return min(score, 100.0)
 
@@ -260,29 +329,14 @@ class MoatScoringEngine:
         Wave 2: Moat 40-60 (arbitrage phase)
         Wave 1: Moat < 40 (replacement phase)
         """
-        if moat_score >= self.config.thresholds.WAVE_4_MOAT_THRESHOLD:
-            return WaveCategory.WAVE_4
-
-        elif moat_score >= self.config.thresholds.STRONG_MOAT:
-            return WaveCategory.WAVE_3
+        wave = self._wave_bands[bisect_right(self._wave_tiers, moat_score)]
 
-        elif moat_score >= self.config.thresholds.MEDIUM_MOAT:
-            return WaveCategory.WAVE_2
-
-        else:
-            # Default to company's current wave classification
-            return company.wave_category
+        # Default to company's current wave classification
+        return wave or company.wave_category
 
     def _classify_durability(self, moat_score: float) -> str:
         """Convert moat score to qualitative durability rating"""
-        if moat_score >= 80:
-            return "Very High"
-        elif moat_score >= 60:
-            return "High"
-        elif moat_score >= 40:
-            return "Medium"
-        else:
-            return "Low"
+        return _DURABILITY_RATINGS[bisect_right(_DURABILITY_TIERS, moat_score)]
 
     def score_companies(
         self,
@@ -292,14 +346,18 @@ class MoatScoringEngine:
         """Score multiple companies in batch"""
         industry_data_map = industry_data_map or {}
 
-        scores = []
-        for company in companies:
-            industry_data = industry_data_map.get(company.company_id, {})
-            score = self.calculate_moat_score(company, industry_data)
-            scores.append(score)
+        # One timestamp and one set of bound lookups for the whole batch
+        now = datetime.now()
+        get_industry_data = industry_data_map.get
+        calculate = self.calculate_moat_score
+
+        scores = [
+            calculate(company, get_industry_data(company.company_id), now)
+            for company in companies
+        ]
 
         # Sort by total moat score descending
-        scores.sort(key=lambda s: s.total_moat_score, reverse=True)
+        scores.sort(key=attrgetter("total_moat_score"), reverse=True)
 
         return scores
 
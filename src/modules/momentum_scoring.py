@@ -3,9 +3,12 @@ Tech Momentum Arbitrage Engine - Momentum Scoring Module
 Implements dual-track momentum scoring: Narrative (Hype) + Execution (Build)
 """
 
+from bisect import bisect_left
 from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import List, Dict, Optional, Tuple
 import math
+import re
 
 from src.core.schemas import (
     Company,
@@ -17,13 +20,83 @@ from src.core.schemas import (
 )
 from src.core.config import Config
 from src.core.utils import (
-    weighted_score,
     moving_average,
     exponential_moving_average,
     normalize_score,
     sigmoid,
 )
 
+# Default for undated records; bound once instead of looked up per record
+_DATETIME_MIN = datetime.min
+
+
+# ======================== SCALAR SCORING KERNELS ========================
+# Branch ladders over plain numbers, so each company field is read once by
+# the caller instead of once per comparison. Each ladder is a table of
+# ascending "greater than" boundaries; bisect_left counts the boundaries a
+# value exceeds, which indexes the matching score.
+
+# Late-stage companies get more conference slots: $50M+, $100M+, $200M+, $500M+
+_CONFERENCE_FUNDING_TIERS = (50_000_000, 100_000_000, 200_000_000, 500_000_000)
+_CONFERENCE_SCORES = (10.0, 25.0, 40.0, 60.0, 80.0)
+
+# ARR magnitude and implied growth: $20M+, $50M+, $100M+, $200M+, $500M+
+_ARR_TIERS = (20_000_000, 50_000_000, 100_000_000, 200_000_000, 500_000_000)
+_ARR_SCORES = (25.0, 45.0, 60.0, 75.0, 85.0, 95.0)
+
+# Funding as revenue proxy when ARR is unknown ($500M+ likely means $100M+ ARR)
+_ARR_PROXY_FUNDING_TIERS = (200_000_000, 500_000_000)
+_ARR_PROXY_SCORES = (30.0, 50.0, 70.0)
+
+# Headcount magnitude
+_HEADCOUNT_TIERS = (200, 500, 1000, 2000, 5000)
+_HEADCOUNT_POINTS = (0.0, 10.0, 15.0, 20.0, 25.0, 30.0)
+
+# Customer adoption and funding stage proxies for product milestones
+_MILESTONE_CUSTOMER_TIERS = (10, 20, 50)
+_MILESTONE_CUSTOMER_POINTS = (0.0, 20.0, 30.0, 40.0)
+_MILESTONE_FUNDING_TIERS = (100_000_000, 200_000_000, 500_000_000)
+_MILESTONE_FUNDING_POINTS = (0.0, 20.0, 30.0, 40.0)
+
+
+def _conference_presence(total_funding: float) -> float:
+    """Conference slot proxy from funding stage"""
+    return _CONFERENCE_SCORES[bisect_left(_CONFERENCE_FUNDING_TIERS, total_funding)]
+
+
+def _revenue_indicators(estimated_arr: Optional[float], total_funding: float) -> float:
+    """Revenue score from ARR, falling back to funding when ARR is unknown"""
+    if not estimated_arr:
+        return _ARR_PROXY_SCORES[bisect_left(_ARR_PROXY_FUNDING_TIERS, total_funding)]
+    return _ARR_SCORES[bisect_left(_ARR_TIERS, estimated_arr)]
+
+
+def _talent_density(
+    employee_count: int, engineer_pct: float, faang_talent_pct: float
+) -> float:
+    """Talent score from headcount, engineer share and FAANG share"""
+    score = _HEADCOUNT_POINTS[bisect_left(_HEADCOUNT_TIERS, employee_count)]
+
+    # Engineer percentage (high talent density)
+    score += normalize_score(engineer_pct, 0, 70, 35)  # 0-70%
+
+    # FAANG talent percentage (quality signal)
+    score += normalize_score(faang_talent_pct, 0, 30, 35)  # 0-30%
+
+    return min(score, 100.0)
+
+
+def _product_milestones(fortune_500_customers: int, total_funding: float) -> float:
+    """Product milestone proxy from customer adoption and funding stage"""
+    base_score = 20.0
+    base_score += _MILESTONE_CUSTOMER_POINTS[
+        bisect_left(_MILESTONE_CUSTOMER_TIERS, fortune_500_customers)
+    ]
+    base_score += _MILESTONE_FUNDING_POINTS[
+        bisect_left(_MILESTONE_FUNDING_TIERS, total_funding)
+    ]
+    return min(base_score, 100.0)
+
 
 class MomentumScoringEngine:
     """
@@ -32,9 +105,59 @@ class MomentumScoringEngine:
     Track B: Execution Momentum (Build Score)
     """
 
+    # Tier-1 VC backing (a16z, Sequoia, etc.)
+    TIER_1_VCS = frozenset(
+        {
+            "Andreessen Horowitz",
+            "Sequoia Capital",
+            "Benchmark",
+            "Lightspeed",
+            "Accel",
+            "Greylock",
+            "Kleiner Perkins",
+            "Index Ventures",
+        }
+    )
+
+    # One substring scan of a lead investor name for every tier-1 firm at once
+    _TIER_1_VC_RE = re.compile("|".join(re.escape(vc) for vc in sorted(TIER_1_VCS)))
+
+    # Component order of each track, as returned by _calculate_*_score
+    HYPE_COMPONENTS = (
+        "media_velocity",
+        "social_signal",
+        "vc_buzz",
+        "conference_presence",
+        "search_trends",
+    )
+    BUILD_COMPONENTS = (
+        "revenue_indicators",
+        "customer_logos",
+        "patent_velocity",
+        "talent_density",
+        "product_milestones",
+    )
+
     def __init__(self, config: Config = Config()):
         self.config = config
 
+        # (component, weight) pairs resolved once, in component order, so each
+        # score is a single pass with no per-call dict walks of the weights
+        scoring = config.scoring
+        self._hype_weights = tuple(
+            (key, scoring.HYPE_WEIGHTS[key])
+            for key in self.HYPE_COMPONENTS
+            if key in scoring.HYPE_WEIGHTS
+        )
+        self._build_weights = tuple(
+            (key, scoring.BUILD_WEIGHTS[key])
+            for key in self.BUILD_COMPONENTS
+            if key in scoring.BUILD_WEIGHTS
+        )
+        composite = scoring.MOMENTUM_COMPOSITE_WEIGHTS
+        self._hype_share = composite.get("hype", 0.0)
+        self._build_share = composite.get("build", 0.0)
+
     def calculate_momentum_score(
         self,
         company: Company,
@@ -42,6 +165,7 @@ class MomentumScoringEngine:
         social_metrics: Dict = None,
         vc_mentions: List[str] = None,
         search_data: Dict = None,
+        now: Optional[datetime] = None,
     ) -> MomentumScore:
         """
         Calculate comprehensive momentum score for a company
@@ -52,30 +176,31 @@ class MomentumScoringEngine:
             social_metrics: Social media metrics (followers, engagement)
             vc_mentions: List of VC thesis mentions
             search_data: Google Trends data
+            now: Scoring time (defaults to now; batches pass one shared value)
 
         Returns:
             MomentumScore object with dual-track scoring
         """
+        now = now or datetime.now()
 
         # Track A: Narrative Momentum (Hype Score)
         hype_components = self._calculate_hype_score(
-            company, media_mentions, social_metrics, vc_mentions, search_data
+            company, media_mentions, social_metrics, vc_mentions, search_data, now
         )
 
         # Track B: Execution Momentum (Build Score)
-        build_components = self._calculate_build_score(company)
+        build_components = self._calculate_build_score(company, now)
 
-        # Composite momentum score
-        hype_score = weighted_score(
-            hype_components, self.config.scoring.HYPE_WEIGHTS
+        # Composite momentum score (same summation order and rounding as
+        # weighted_score)
+        hype_score = round(
+            sum(hype_components[key] * w for key, w in self._hype_weights), 2
         )
-        build_score = weighted_score(
-            build_components, self.config.scoring.BUILD_WEIGHTS
+        build_score = round(
+            sum(build_components[key] * w for key, w in self._build_weights), 2
         )
-
-        momentum_score = weighted_score(
-            {"hype": hype_score, "build": build_score},
-            self.config.scoring.MOMENTUM_COMPOSITE_WEIGHTS,
+        momentum_score = round(
+            hype_score * self._hype_share + build_score * self._build_share, 2
         )
 
         # Detect divergence
@@ -85,25 +210,17 @@ class MomentumScoringEngine:
             company_id=company.company_id,
             company_name=company.name,
             # Hype components
-            media_velocity=hype_components["media_velocity"],
-            social_signal=hype_components["social_signal"],
-            vc_buzz=hype_components["vc_buzz"],
-            conference_presence=hype_components["conference_presence"],
-            search_trends=hype_components["search_trends"],
+            **hype_components,
             hype_score=hype_score,
             # Build components
-            revenue_indicators=build_components["revenue_indicators"],
-            customer_logos=build_components["customer_logos"],
-            patent_velocity=build_components["patent_velocity"],
-            talent_density=build_components["talent_density"],
-            product_milestones=build_components["product_milestones"],
+            **build_components,
             build_score=build_score,
             # Composite
             momentum_score=momentum_score,
             momentum_change_7d=0.0,  # Would be calculated from time series
             momentum_change_30d=0.0,
             divergence_flag=divergence_flag,
-            timestamp=datetime.now(),
+            timestamp=now,
         )
 
     def _calculate_hype_score(
@@ -113,6 +230,7 @@ class MomentumScoringEngine:
         social_metrics: Optional[Dict],
         vc_mentions: Optional[List[str]],
         search_data: Optional[Dict],
+        now: datetime,
     ) -> Dict[str, float]:
         """
         Calculate Track A: Narrative Momentum (Hype)
@@ -126,13 +244,13 @@ class MomentumScoringEngine:
         """
 
         # 1. Media Velocity (0-100)
-        media_velocity = self._score_media_velocity(media_mentions)
+        media_velocity = self._score_media_velocity(media_mentions, now)
 
         # 2. Social Signal (0-100)
         social_signal = self._score_social_signal(social_metrics)
 
         # 3. VC Buzz (0-100)
-        vc_buzz = self._score_vc_buzz(vc_mentions, company.funding_rounds)
+        vc_buzz = self._score_vc_buzz(vc_mentions, company.funding_rounds, now)
 
         # 4. Conference Presence (0-100)
         conference_presence = self._score_conference_presence(company)
@@ -148,7 +266,9 @@ class MomentumScoringEngine:
             "search_trends": search_trends,
         }
 
-    def _calculate_build_score(self, company: Company) -> Dict[str, float]:
+    def _calculate_build_score(
+        self, company: Company, now: datetime
+    ) -> Dict[str, float]:
         """
         Calculate Track B: Execution Momentum (Build)
 
@@ -159,21 +279,26 @@ class MomentumScoringEngine:
         4. Talent Density - Engineer headcount + FAANG talent %
         5. Product Milestones - GA launches, API adoption
         """
+        # Shared company fields, read once for all five components
+        total_funding = company.total_funding
+        fortune_500_customers = company.fortune_500_customers
 
         # 1. Revenue Indicators (0-100)
-        revenue_indicators = self._score_revenue_indicators(company)
+        revenue_indicators = _revenue_indicators(company.estimated_arr, total_funding)
 
-        # 2. Customer Logos (0-100)
-        customer_logos = self._score_customer_logos(company)
+        # 2. Customer Logos (0-100): 0 customers = 0, 100+ customers = 100
+        customer_logos = normalize_score(fortune_500_customers, 0, 100, 100)
 
         # 3. Patent Velocity (0-100)
-        patent_velocity = self._score_patent_velocity(company.patent_grants)
+        patent_velocity = self._score_patent_velocity(company.patent_grants, now)
 
         # 4. Talent Density (0-100)
-        talent_density = self._score_talent_density(company)
+        talent_density = _talent_density(
+            company.employee_count, company.engineer_pct, company.faang_talent_pct
+        )
 
         # 5. Product Milestones (0-100)
-        product_milestones = self._score_product_milestones(company)
+        product_milestones = _product_milestones(fortune_500_customers, total_funding)
 
         return {
             "revenue_indicators": revenue_indicators,
@@ -185,18 +310,18 @@ class MomentumScoringEngine:
 
     # ======================== HYPE SCORING FUNCTIONS ========================
 
-    def _score_media_velocity(self, media_mentions: Optional[List[Dict]]) -> float:
+    def _score_media_velocity(
+        self, media_mentions: Optional[List[Dict]], now: datetime
+    ) -> float:
         """Score based on media mention frequency (30-day MA)"""
         if not media_mentions:
             return 20.0  # Baseline for unknown
 
-        # Count mentions in last 30 days
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_mentions = [
-            m for m in media_mentions if m.get("date", datetime.min) > thirty_days_ago
-        ]
-
-        mention_count = len(recent_mentions)
+        # Count mentions in last 30 days (no intermediate list)
+        thirty_days_ago = now - timedelta(days=30)
+        mention_count = sum(
+            1 for m in media_mentions if m.get("date", _DATETIME_MIN) > thirty_days_ago
+        )
 
         # Normalize: 0 mentions = 0, 50+ mentions = 100
         return normalize_score(mention_count, 0, 50, 100)
@@ -220,7 +345,10 @@ class MomentumScoringEngine:
         return linkedin_score + twitter_score
 
     def _score_vc_buzz(
-        self, vc_mentions: Optional[List[str]], funding_rounds: List[FundingRound]
+        self,
+        vc_mentions: Optional[List[str]],
+        funding_rounds: List[FundingRound],
+        now: datetime,
     ) -> float:
         """Score based on VC thesis mentions and investor quality"""
         score = 0.0
@@ -231,27 +359,14 @@ class MomentumScoringEngine:
             score += normalize_score(mention_count, 0, 10, 40)
 
         # Tier-1 VC backing (a16z, Sequoia, etc.)
-        tier_1_vcs = {
-            "Andreessen Horowitz",
-            "Sequoia Capital",
-            "Benchmark",
-            "Lightspeed",
-            "Accel",
-            "Greylock",
-            "Kleiner Perkins",
-            "Index Ventures",
-        }
-
-        has_tier_1 = any(
-            any(vc in round.lead_investor for vc in tier_1_vcs)
-            for round in funding_rounds
-        )
+        tier_1_search = self._TIER_1_VC_RE.search
+        has_tier_1 = any(tier_1_search(round.lead_investor) for round in funding_rounds)
 
         if has_tier_1:
             score += 30.0
 
         # Recent funding activity (last 6 months)
-        six_months_ago = datetime.now() - timedelta(days=180)
+        six_months_ago = now - timedelta(days=180)
         recent_funding = any(round.date > six_months_ago for round in funding_rounds)
 
         if recent_funding:
@@ -263,20 +378,7 @@ class MomentumScoringEngine:
         """Score based on conference appearances (proxy via sector and stage)"""
         # In real implementation, would track actual conference speaking slots
         # For now, use funding stage as proxy
-
-        total_funding = company.total_funding
-
-        # Late-stage companies get more conference slots
-        if total_funding > 500_000_000:  # $500M+
-            return 80.0
-        elif total_funding > 200_000_000:  # $200M+
-            return 60.0
-        elif total_funding > 100_000_000:  # $100M+
-            return 40.0
-        elif total_funding > 50_000_000:  # $50M+
-            return 25.0
-        else:
-            return 10.0
+        return _conference_presence(company.total_funding)
 
     def _score_search_trends(self, search_data: Optional[Dict]) -> float:
         """Score based on Google Trends data"""
@@ -298,30 +400,7 @@ class MomentumScoringEngine:
 
     def _score_revenue_indicators(self, company: Company) -> float:
         """Score based on revenue growth indicators"""
-        if not company.estimated_arr:
-            # Use funding as proxy if no ARR data
-            if company.total_funding > 500_000_000:
-                return 70.0  # Likely $100M+ ARR
-            elif company.total_funding > 200_000_000:
-                return 50.0
-            else:
-                return 30.0
-
-        arr = company.estimated_arr
-
-        # Score based on ARR magnitude and implied growth
-        if arr > 500_000_000:  # $500M+
-            return 95.0
-        elif arr > 200_000_000:  # $200M+
-            return 85.0
-        elif arr > 100_000_000:  # $100M+
-            return 75.0
-        elif arr > 50_000_000:  # $50M+
-            return 60.0
-        elif arr > 20_000_000:  # $20M+
-            return 45.0
-        else:
-            return 25.0
+        return _revenue_indicators(company.estimated_arr, company.total_funding)
 
     def _score_customer_logos(self, company: Company) -> float:
         """Score based on Fortune 500 customer count"""
@@ -330,18 +409,20 @@ class MomentumScoringEngine:
         # Normalize: 0 customers = 0, 100+ customers = 100
         return normalize_score(f500_count, 0, 100, 100)
 
-    def _score_patent_velocity(self, patent_grants: List[PatentGrant]) -> float:
+    def _score_patent_velocity(
+        self, patent_grants: List[PatentGrant], now: datetime
+    ) -> float:
         """Score based on patent grants per quarter (citation-weighted)"""
         if not patent_grants:
             return 15.0  # Baseline for no patents
 
-        # Count grants in last year
-        one_year_ago = datetime.now() - timedelta(days=365)
-        recent_grants = [p for p in patent_grants if p.grant_date > one_year_ago]
-
-        # Weight by citations
+        # Citation-weighted count of grants in last year, filtered and summed
+        # in one pass
+        one_year_ago = now - timedelta(days=365)
         weighted_count = sum(
-            1 + (patent.citation_count * 0.1) for patent in recent_grants
+            1 + (patent.citation_count * 0.1)
+            for patent in patent_grants
+            if patent.grant_date > one_year_ago
         )
 
         # Quarterly rate
@@ -352,54 +433,15 @@ class MomentumScoringEngine:
 
     def _score_talent_density(self, company: Company) -> float:
         """Score based on engineer headcount growth and FAANG talent %"""
-        score = 0.0
-
-        # Headcount magnitude
-        if company.employee_count > 5000:
-            score += 30.0
-        elif company.employee_count > 2000:
-            score += 25.0
-        elif company.employee_count > 1000:
-            score += 20.0
-        elif company.employee_count > 500:
-            score += 15.0
-        elif company.employee_count > 200:
-            score += 10.0
-
-        # Engineer percentage (high talent density)
-        engineer_score = normalize_score(company.engineer_pct, 0, 70, 35)  # 0-70%
-        score += engineer_score
-
-        # FAANG talent percentage (quality signal)
-        faang_score = normalize_score(company.faang_talent_pct, 0, 30, 35)  # 0-30%
-        score += faang_score
-
-        return min(score, 100.0)
+        return _talent_density(
+            company.employee_count, company.engineer_pct, company.faang_talent_pct
+        )
 
     def _score_product_milestones(self, company: Company) -> float:
         """Score based on product launches and adoption (proxy via customers)"""
         # In real implementation, would track actual GA launches, API adoption metrics
         # For now, use customer count as proxy for product-market fit
-
-        base_score = 20.0
-
-        # Customer adoption proxy
-        if company.fortune_500_customers > 50:
-            base_score += 40.0
-        elif company.fortune_500_customers > 20:
-            base_score += 30.0
-        elif company.fortune_500_customers > 10:
-            base_score += 20.0
-
-        # Funding stage proxy (later stage = more product milestones)
-        if company.total_funding > 500_000_000:
-            base_score += 40.0
-        elif company.total_funding > 200_000_000:
-            base_score += 30.0
-        elif company.total_funding > 100_000_000:
-            base_score += 20.0
-
-        return min(base_score, 100.0)
+        return _product_milestones(company.fortune_500_customers, company.total_funding)
 
     # ======================== DIVERGENCE DETECTION ========================
 
@@ -447,6 +489,9 @@ class MomentumScoringEngine:
         """
         scores = []
 
+        # "Now" is the same instant for every company in the batch
+        now = datetime.now()
+
         for company in companies:
             # Get external data if available
             ext_data = external_data.get(company.company_id, {}) if external_data else {}
@@ -457,12 +502,13 @@ class MomentumScoringEngine:
                 social_metrics=ext_data.get("social_metrics"),
                 vc_mentions=ext_data.get("vc_mentions"),
                 search_data=ext_data.get("search_data"),
+                now=now,
             )
 
             scores.append(score)
 
         # Sort by momentum score descending
-        scores.sort(key=lambda s: s.momentum_score, reverse=True)
+        scores.sort(key=attrgetter("momentum_score"), reverse=True)
 
         return scores
 
@@ -4,9 +4,178 @@ Identifies suppliers to the suppliers - mispriced exposure to Wave 1 tech
 """
 
 from datetime import datetime
-from typing import List, Dict, Tuple
+from functools import lru_cache
+import heapq
+from operator import itemgetter
+from types import MappingProxyType
+from typing import List, Dict, Optional, Tuple
 from src.core.schemas import SecondOrderPlay, Sector, MomentumScore
 from src.core.config import Config
+from src.core.utils import KeywordClassifier
+
+
+# Company-name keywords per sector; earlier sectors win when several match
+_NAME_SECTORS = KeywordClassifier(
+    {
+        Sector.AI_INFRA: ["ai", "gpu", "inference", "training", "cerebras", "groq"],
+        Sector.SIX_G: ["satellite", "6g", "wireless", "ast"],
+        Sector.QUANTUM: ["quantum", "ionq", "rigetti"],
+        Sector.GREEN_ENERGY: ["energy", "battery", "solar", "form"],
+        Sector.SEMICONDUCTORS: ["chip", "semiconductor", "tenstorrent"],
+        Sector.CYBERSECURITY: ["security", "cyber", "wiz"],
+        Sector.DATA_INFRA: ["data", "databricks", "fivetran"],
+    }
+)
+
+
+# Dependency mapping: Primary tech → Supplier categories. Template built once at
+# import; every engine gets its own copy (see _copy_dependency_map).
+_DEPENDENCY_MAP = MappingProxyType(
+    {
+        Sector.AI_INFRA: [
+            {
+                "category": "Datacenter Cooling",
+                "suppliers": [
+                    {"name": "Vertiv (VRT)", "ticker": "VRT", "dependency": 0.87},
+                    {"name": "nVent Electric (NVT)", "ticker": "NVT", "dependency": 0.72},
+                ],
+                "thesis": "AI datacenter buildout requires 3x cooling capacity for GPU clusters",
+            },
+            {
+                "category": "Power Infrastructure",
+                "suppliers": [
+                    {"name": "Eaton (ETN)", "ticker": "ETN", "dependency": 0.78},
+                    {"name": "Schneider Electric (SBGSY)", "ticker": "SBGSY", "dependency": 0.75},
+                ],
+                "thesis": "AI compute demands robust UPS and power distribution systems",
+            },
+            {
+                "category": "Networking Equipment",
+                "suppliers": [
+                    {"name": "Arista Networks (ANET)", "ticker": "ANET", "dependency": 0.91},
+                    {"name": "Juniper Networks (JNPR)", "ticker": "JNPR", "dependency": 0.68},
+                ],
+                "thesis": "GPU cluster interconnects require high-bandwidth networking",
+            },
+        ],
+        Sector.SIX_G: [
+            {
+                "category": "RF Components",
+                "suppliers": [
+                    {"name": "Qorvo (QRVO)", "ticker": "QRVO", "dependency": 0.85},
+                    {"name": "Skyworks Solutions (SWKS)", "ticker": "SWKS", "dependency": 0.82},
+                ],
+                "thesis": "6G and satellite mesh require advanced RF filtering and amplification",
+            },
+            {
+                "category": "Fiber Optics",
+                "suppliers": [
+                    {"name": "Corning (GLW)", "ticker": "GLW", "dependency": 0.79},
+                    {"name": "Lumentum (LITE)", "ticker": "LITE", "dependency": 0.71},
+                ],
+                "thesis": "Backhaul infrastructure for 6G requires massive fiber deployment",
+            },
+        ],
+        Sector.QUANTUM: [
+            {
+                "category": "Cryogenic Systems",
+                "suppliers": [
+                    {"name": "BlueFors (Private)", "ticker": None, "dependency": 0.92},
+                    {"name": "Oxford Instruments (OXIG.L)", "ticker": "OXIG.L", "dependency": 0.73},
+                ],
+                "thesis": "Quantum computers require dilution refrigerators at millikelvin temperatures",
+            },
+            {
+                "category": "Control Electronics",
+                "suppliers": [
+                    {"name": "Keysight (KEYS)", "ticker": "KEYS", "dependency": 0.68},
+                    {"name": "Zurich Instruments (Private)", "ticker": None, "dependency": 0.84},
+                ],
+                "thesis": "Quantum systems need precision control and measurement electronics",
+            },
+        ],
+        Sector.GREEN_ENERGY: [
+            {
+                "category": "Rare Earth Mining",
+                "suppliers": [
+                    {"name": "MP Materials (MP)", "ticker": "MP", "dependency": 0.81},
+                    {"name": "Lynas Rare Earths (LYSDY)", "ticker": "LYSDY", "dependency": 0.76},
+                ],
+                "thesis": "Wind turbines and EV motors require neodymium and dysprosium",
+            },
+            {
+                "category": "Grid Storage Components",
+                "suppliers": [
+                    {"name": "Fluence Energy (FLNC)", "ticker": "FLNC", "dependency": 0.88},
+                    {"name": "Enphase Energy (ENPH)", "ticker": "ENPH", "dependency": 0.79},
+                ],
+                "thesis": "Renewable intermittency drives massive battery storage deployment",
+            },
+        ],
+        Sector.SEMICONDUCTORS: [
+            {
+                "category": "Semiconductor Equipment",
+                "suppliers": [
+                    {"name": "ASML (ASML)", "ticker": "ASML", "dependency": 0.95},
+                    {"name": "Applied Materials (AMAT)", "ticker": "AMAT", "dependency": 0.91},
+                    {"name": "Lam Research (LRCX)", "ticker": "LRCX", "dependency": 0.89},
+                ],
+                "thesis": "Chip fab buildout requires advanced lithography and deposition tools",
+            },
+            {
+                "category": "Materials & Chemicals",
+                "suppliers": [
+                    {"name": "Entegris (ENTG)", "ticker": "ENTG", "dependency": 0.84},
+                    {"name": "Cabot Microelectronics (CCMP)", "ticker": "CCMP", "dependency": 0.77},
+                ],
+                "thesis": "Advanced nodes require specialized chemicals and materials",
+            },
+        ],
+        Sector.CYBERSECURITY: [
+            {
+                "category": "Identity Infrastructure",
+                "suppliers": [
+                    {"name": "Okta (OKTA)", "ticker": "OKTA", "dependency": 0.72},
+                    {"name": "Ping Identity (PING)", "ticker": "PING", "dependency": 0.68},
+                ],
+                "thesis": "Zero-trust architectures built on identity as perimeter",
+            },
+        ],
+        Sector.DATA_INFRA: [
+            {
+                "category": "Cloud Storage",
+                "suppliers": [
+                    {"name": "Pure Storage (PSTG)", "ticker": "PSTG", "dependency": 0.76},
+                    {"name": "NetApp (NTAP)", "ticker": "NTAP", "dependency": 0.71},
+                ],
+                "thesis": "Data infrastructure growth drives storage infrastructure demand",
+            },
+        ],
+    }
+)
+
+
+def _copy_dependency_map() -> Dict[Sector, List[Dict]]:
+    """Fresh, independently mutable copy of the dependency map template"""
+    return {
+        sector: [
+            {
+                **dep_category,
+                "suppliers": [dict(supplier) for supplier in dep_category["suppliers"]],
+            }
+            for dep_category in dependencies
+        ]
+        for sector, dependencies in _DEPENDENCY_MAP.items()
+    }
+
+
+def _opportunity(play: SecondOrderPlay) -> float:
+    """Opportunity quality: high dependency, low price correlation"""
+    return play.dependency_score - play.price_correlation
+
+
+# Same score, precomputed as the first field of a candidate row
+_ROW_OPPORTUNITY = itemgetter(0)
 
 
 class SecondOrderArbitrageEngine:
@@ -21,133 +190,14 @@ class SecondOrderArbitrageEngine:
     def __init__(self, config: Config = Config()):
         self.config = config
 
-        # Dependency mapping: Primary tech → Supplier categories
-        self.dependency_map = {
-            Sector.AI_INFRA: [
-                {
-                    "category": "Datacenter Cooling",
-                    "suppliers": [
-                        {"name": "Vertiv (VRT)", "ticker": "VRT", "dependency": 0.87},
-                        {"name": "nVent Electric (NVT)", "ticker": "NVT", "dependency": 0.72},
-                    ],
-                    "thesis": "AI datacenter buildout requires 3x cooling capacity for GPU clusters",
-                },
-                {
-                    "category": "Power Infrastructure",
-                    "suppliers": [
-                        {"name": "Eaton (ETN)", "ticker": "ETN", "dependency": 0.78},
-                        {"name": "Schneider Electric (SBGSY)", "ticker": "SBGSY", "dependency": 0.75},
-                    ],
-                    "thesis": "AI compute demands robust UPS and power distribution systems",
-                },
-                {
-                    "category": "Networking Equipment",
-                    "suppliers": [
-                        {"name": "Arista Networks (ANET)", "ticker": "ANET", "dependency": 0.91},
-                        {"name": "Juniper Networks (JNPR)", "ticker": "JNPR", "dependency": 0.68},
-                    ],
-                    "thesis": "GPU cluster interconnects require high-bandwidth networking",
-                },
-            ],
-            Sector.SIX_G: [
-                {
-                    "category": "RF Components",
-                    "suppliers": [
-                        {"name": "Qorvo (QRVO)", "ticker": "QRVO", "dependency": 0.85},
-                        {"name": "Skyworks Solutions (SWKS)", "ticker": "SWKS", "dependency": 0.82},
-                    ],
-                    "thesis": "6G and satellite mesh require advanced RF filtering and amplification",
-                },
-                {
-                    "category": "Fiber Optics",
-                    "suppliers": [
-                        {"name": "Corning (GLW)", "ticker": "GLW", "dependency": 0.79},
-                        {"name": "Lumentum (LITE)", "ticker": "LITE", "dependency": 0.71},
-                    ],
-                    "thesis": "Backhaul infrastructure for 6G requires massive fiber deployment",
-                },
-            ],
-            Sector.QUANTUM: [
-                {
-                    "category": "Cryogenic Systems",
-                    "suppliers": [
-                        {"name": "BlueFors (Private)", "ticker": None, "dependency": 0.92},
-                        {"name": "Oxford Instruments (OXIG.L)", "ticker": "OXIG.L", "dependency": 0.73},
-                    ],
-                    "thesis": "Quantum computers require dilution refrigerators at millikelvin temperatures",
-                },
-                {
-                    "category": "Control Electronics",
-                    "suppliers": [
-                        {"name": "Keysight (KEYS)", "ticker": "KEYS", "dependency": 0.68},
-                        {"name": "Zurich Instruments (Private)", "ticker": None, "dependency": 0.84},
-                    ],
-                    "thesis": "Quantum systems need precision control and measurement electronics",
-                },
-            ],
-            Sector.GREEN_ENERGY: [
-                {
-                    "category": "Rare Earth Mining",
-                    "suppliers": [
-                        {"name": "MP Materials (MP)", "ticker": "MP", "dependency": 0.81},
-                        {"name": "Lynas Rare Earths (LYSDY)", "ticker": "LYSDY", "dependency": 0.76},
-                    ],
-                    "thesis": "Wind turbines and EV motors require neodymium and dysprosium",
-                },
-                {
-                    "category": "Grid Storage Components",
-                    "suppliers": [
-                        {"name": "Fluence Energy (FLNC)", "ticker": "FLNC", "dependency": 0.88},
-                        {"name": "Enphase Energy (ENPH)", "ticker": "ENPH", "dependency": 0.79},
-                    ],
-                    "thesis": "Renewable intermittency drives massive battery storage deployment",
-                },
-            ],
-            Sector.SEMICONDUCTORS: [
-                {
-                    "category": "Semiconductor Equipment",
-                    "suppliers": [
-                        {"name": "ASML (ASML)", "ticker": "ASML", "dependency": 0.95},
-                        {"name": "Applied Materials (AMAT)", "ticker": "AMAT", "dependency": 0.91},
-                        {"name": "Lam Research (LRCX)", "ticker": "LRCX", "dependency": 0.89},
-                    ],
-                    "thesis": "Chip fab buildout requires advanced lithography and deposition tools",
-                },
-                {
-                    "category": "Materials & Chemicals",
-                    "suppliers": [
-                        {"name": "Entegris (ENTG)", "ticker": "ENTG", "dependency": 0.84},
-                        {"name": "Cabot Microelectronics (CCMP)", "ticker": "CCMP", "dependency": 0.77},
-                    ],
-                    "thesis": "Advanced nodes require specialized chemicals and materials",
-                },
-            ],
-            Sector.CYBERSECURITY: [
-                {
-                    "category": "Identity Infrastructure",
-                    "suppliers": [
-                        {"name": "Okta (OKTA)", "ticker": "OKTA", "dependency": 0.72},
-                        {"name": "Ping Identity (PING)", "ticker": "PING", "dependency": 0.68},
-                    ],
-                    "thesis": "Zero-trust architectures built on identity as perimeter",
-                },
-            ],
-            Sector.DATA_INFRA: [
-                {
-                    "category": "Cloud Storage",
-                    "suppliers": [
-                        {"name": "Pure Storage (PSTG)", "ticker": "PSTG", "dependency": 0.76},
-                        {"name": "NetApp (NTAP)", "ticker": "NTAP", "dependency": 0.71},
-                    ],
-                    "thesis": "Data infrastructure growth drives storage infrastructure demand",
-                },
-            ],
-        }
+        # Dependency mapping: Primary tech → Supplier categories (per engine)
+        self.dependency_map = _copy_dependency_map()
 
     def find_second_order_plays(
         self,
         momentum_scores: List[MomentumScore],
         price_correlations: Dict[str, float] = None,
+        top_n: Optional[int] = None,
     ) -> List[SecondOrderPlay]:
         """
         Identify second-order arbitrage opportunities
@@ -155,12 +205,25 @@ class SecondOrderArbitrageEngine:
         Args:
             momentum_scores: Momentum scores for primary technologies
             price_correlations: Historical price correlations (ticker -> correlation)
+            top_n: Only return the best N plays (partial selection, no full sort)
 
         Returns:
-            List of SecondOrderPlay objects
+            List of SecondOrderPlay objects, best opportunities first
         """
         price_correlations = price_correlations or {}
-        plays = []
+
+        # Plain tuples per candidate play, led by the opportunity score so they
+        # sort without a key function; models are built once at the end
+        rows = []
+
+        # Supplier candidates per sector, evaluated once per call and shared by
+        # every high-momentum company inferred into that sector
+        sector_candidates = {}
+
+        # One timestamp shared by every play found in this call
+        now = datetime.now()
+        high_dependency = self.config.thresholds.HIGH_DEPENDENCY
+        low_correlation = self.config.thresholds.LOW_CORRELATION
 
         # Identify high-momentum primary technologies
         high_momentum = [s for s in momentum_scores if s.momentum_score > 70]
@@ -169,81 +232,116 @@ class SecondOrderArbitrageEngine:
             # Find sector dependencies
             sector = self._infer_sector(momentum_score.company_name)
 
-            if sector in self.dependency_map:
-                dependencies = self.dependency_map[sector]
-
-                for dep_category in dependencies:
-                    for supplier in dep_category["suppliers"]:
-                        if not supplier["ticker"]:
-                            continue  # Skip private companies
-
-                        # Get price correlation (if available)
-                        ticker = supplier["ticker"]
-                        correlation = price_correlations.get(ticker, 0.50)  # Default 0.50
-
-                        # Opportunity if HIGH dependency but LOW correlation
-                        is_mispriced = (
-                            supplier["dependency"] > self.config.thresholds.HIGH_DEPENDENCY
-                            and correlation < self.config.thresholds.LOW_CORRELATION
-                        )
-
-                        if is_mispriced:
-                            entry_timing = "Immediate"
-                            risk_return = "High"
-                        else:
-                            entry_timing = "Monitor"
-                            risk_return = "Medium"
-
-                        play = SecondOrderPlay(
-                            primary_technology=momentum_score.company_name,
-                            primary_momentum_score=momentum_score.momentum_score,
-                            supplier_company=supplier["name"],
-                            supplier_ticker=ticker,
-                            exposure_type=dep_category["category"],
-                            dependency_score=supplier["dependency"],
-                            price_correlation=correlation,
-                            thesis=dep_category["thesis"],
-                            entry_timing=entry_timing,
-                            risk_adjusted_return=risk_return,
-                            timestamp=datetime.now(),
-                        )
-
-                        plays.append(play)
-
-        # Sort by opportunity quality (high dependency, low correlation)
-        plays.sort(
-            key=lambda p: p.dependency_score - p.price_correlation, reverse=True
-        )
-
-        return plays
-
-    def _infer_sector(self, company_name: str) -> Sector:
-        """Infer sector from company name (simplified)"""
-        # In production, would look up from company database
-        name_lower = company_name.lower()
-
-        if any(
-            kw in name_lower for kw in ["ai", "gpu", "inference", "training", "cerebras", "groq"]
-        ):
-            return Sector.AI_INFRA
-        elif any(kw in name_lower for kw in ["satellite", "6g", "wireless", "ast"]):
-            return Sector.SIX_G
-        elif any(kw in name_lower for kw in ["quantum", "ionq", "rigetti"]):
-            return Sector.QUANTUM
-        elif any(kw in name_lower for kw in ["energy", "battery", "solar", "form"]):
-            return Sector.GREEN_ENERGY
-        elif any(kw in name_lower for kw in ["chip", "semiconductor", "tenstorrent"]):
-            return Sector.SEMICONDUCTORS
-        elif any(kw in name_lower for kw in ["security", "cyber", "wiz"]):
-            return Sector.CYBERSECURITY
-        elif any(kw in name_lower for kw in ["data", "databricks", "fivetran"]):
-            return Sector.DATA_INFRA
+            candidates = sector_candidates.get(sector)
+            if candidates is None:
+                candidates = sector_candidates[sector] = self._supplier_candidates(
+                    sector, price_correlations, high_dependency, low_correlation
+                )
+
+            # Rows keep company-then-supplier order, so equal scores rank as before
+            rows.extend(candidate + (momentum_score,) for candidate in candidates)
+
+        # Sort by opportunity quality (high dependency, low correlation), before
+        # any model exists; only the selected rows become plays
+        if top_n is not None:
+            rows = heapq.nlargest(top_n, rows, key=_ROW_OPPORTUNITY)
         else:
-            return Sector.AI_INFRA  # Default
+            rows.sort(key=_ROW_OPPORTUNITY, reverse=True)
+
+        return [
+            SecondOrderPlay(
+                primary_technology=momentum_score.company_name,
+                primary_momentum_score=momentum_score.momentum_score,
+                supplier_company=name,
+                supplier_ticker=ticker,
+                exposure_type=category,
+                dependency_score=dependency,
+                price_correlation=correlation,
+                thesis=thesis,
+                entry_timing=entry_timing,
+                risk_adjusted_return=risk_return,
+                timestamp=now,
+            )
+            for (
+                _,
+                name,
+                ticker,
+                category,
+                dependency,
+                correlation,
+                thesis,
+                entry_timing,
+                risk_return,
+                momentum_score,
+            ) in rows
+        ]
+
+    def _supplier_candidates(
+        self,
+        sector: Sector,
+        price_correlations: Dict[str, float],
+        high_dependency: float,
+        low_correlation: float,
+    ) -> List[Tuple]:
+        """
+        Score one sector's public suppliers against current price correlations
+
+        Reads dependency_map on every call, so changes to an engine's map take
+        effect on the next search.
+        """
+        candidates = []
+
+        for dep_category in self.dependency_map.get(sector, ()):
+            category = dep_category["category"]
+            thesis = dep_category["thesis"]
+
+            for supplier in dep_category["suppliers"]:
+                ticker = supplier["ticker"]
+                if not ticker:
+                    continue  # Skip private companies
+
+                # Get price correlation (if available)
+                correlation = price_correlations.get(ticker, 0.50)  # Default 0.50
+                dependency = supplier["dependency"]
+
+                # Opportunity if HIGH dependency but LOW correlation
+                is_mispriced = (
+                    dependency > high_dependency and correlation < low_correlation
+                )
+
+                if is_mispriced:
+                    entry_timing = "Immediate"
+                    risk_return = "High"
+                else:
+                    entry_timing = "Monitor"
+                    risk_return = "Medium"
+
+                candidates.append(
+                    (
+                        dependency - correlation,
+                        supplier["name"],
+                        ticker,
+                        category,
+                        dependency,
+                        correlation,
+                        thesis,
+                        entry_timing,
+                        risk_return,
+                    )
+                )
+
+        return candidates
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _infer_sector(company_name: str) -> Sector:
+        """Infer sector from company name (simplified, memoized per name)"""
+        # In production, would look up from company database
+        return _NAME_SECTORS.match(company_name.lower(), Sector.AI_INFRA)  # Default
 
     def get_top_plays(self, plays: List[SecondOrderPlay], n: int = 10) -> List[SecondOrderPlay]:
-        """Get top N second-order plays"""
-        return plays[:n]
+        """Get top N second-order plays (input need not be sorted)"""
+        return heapq.nlargest(n, plays, key=_opportunity)
 
     def filter_immediate_entry(self, plays: List[SecondOrderPlay]) -> List[SecondOrderPlay]:
         """Filter for immediate entry opportunities"""
@@ -253,12 +351,9 @@ class SecondOrderArbitrageEngine:
 # ======================== GENERATE MOCK CORRELATIONS ========================
 
 
-def generate_mock_correlations() -> Dict[str, float]:
-    """
-    Generate realistic price correlations for demonstration
-    In production, would calculate from historical price data
-    """
-    return {
+# Demonstration correlations, built once; callers get their own copy
+_MOCK_CORRELATIONS = MappingProxyType(
+    {
         # AI Infrastructure suppliers (varied correlations)
         "VRT": 0.34,  # Vertiv - LOW correlation (opportunity!)
         "NVT": 0.42,  # nVent - LOW correlation
@@ -292,3 +387,12 @@ def generate_mock_correlations() -> Dict[str, float]:
         "PSTG": 0.55,  # Pure Storage - MEDIUM
         "NTAP": 0.58,  # NetApp - MEDIUM
     }
+)
+
+
+def generate_mock_correlations() -> Dict[str, float]:
+    """
+    Generate realistic price correlations for demonstration
+    In production, would calculate from historical price data
+    """
+    return dict(_MOCK_CORRELATIONS)
@@ -3,13 +3,64 @@ Tech Momentum Arbitrage Engine - Timing & Catalyst Prediction Module
 Predicts WHEN momentum converts to tradeable events
 """
 
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
-import math
+from functools import lru_cache
+from typing import List, Dict, Optional
 
-from src.core.schemas import Company, Catalyst, ExecutiveHire
+from src.core.schemas import Company, Catalyst, ExecutiveHire, Sector
 from src.core.config import Config
-from src.core.utils import days_until, probability_decay, time_to_catalyst
+
+
+_SIX_MONTHS = timedelta(days=180)
+_NINE_MONTHS = timedelta(days=270)
+_TWELVE_MONTHS = timedelta(days=365)
+_FIFTEEN_MONTHS = timedelta(days=450)
+_EIGHTEEN_MONTHS = timedelta(days=540)
+_TWO_YEARS = timedelta(days=730)
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+# IPO readiness ladders: ascending "greater than" boundaries, where
+# bisect_left counts the boundaries a value exceeds to index the probability.
+# Funding stage: $150M+ (Series C/D), $300M+, $500M+, $1B+ (unicorn+)
+_IPO_FUNDING_TIERS = (150_000_000, 300_000_000, 500_000_000, 1_000_000_000)
+_IPO_FUNDING_PROBS = (0.10, 0.25, 0.45, 0.60, 0.75)
+
+# Revenue scale: $50M+, $100M+ (typical minimum), $200M+, $500M+ ARR
+_IPO_ARR_TIERS = (50_000_000, 100_000_000, 200_000_000, 500_000_000)
+_IPO_ARR_READINESS = (0.15, 0.35, 0.60, 0.75, 0.90)
+
+# M&A exit window: moderate funding, below the likely-IPO scale
+_MA_MIN_FUNDING = 100_000_000
+_MA_MAX_FUNDING = 500_000_000
+
+# Sectors with a regulatory approval catalyst
+_REGULATED_SECTORS = {
+    Sector.BIOTECH_INFRA: {"agency": "FDA", "avg_timeline_days": 365},
+    Sector.SIX_G: {"agency": "FCC", "avg_timeline_days": 180},
+    Sector.GREEN_ENERGY: {"agency": "DOE/FERC", "avg_timeline_days": 270},
+}
+
+# Sectors with high M&A activity
+_HIGH_MA_SECTORS = frozenset(
+    {Sector.CYBERSECURITY, Sector.DATA_INFRA, Sector.BIOTECH_INFRA}
+)
+
+# Capital-intensive sectors (profitability scrutiny at IPO)
+_CAPEX_HEAVY_SECTORS = frozenset(
+    {Sector.SEMICONDUCTORS, Sector.QUANTUM, Sector.SIX_G, Sector.GREEN_ENERGY}
+)
+
+_DEFAULT_MARKET_CONDITIONS = {"ipo_window": "open", "volatility": "low"}
+
+
+@lru_cache(maxsize=1024)
+def _is_cfo_role(role: str) -> bool:
+    """CFO / Chief Financial Officer title check (memoized per role string)"""
+    upper = role.upper()
+    return "CFO" in upper or "CHIEF FINANCIAL" in upper
 
 
 class TimingPredictionEngine:
@@ -21,11 +72,21 @@ class TimingPredictionEngine:
     - Regulatory approvals
     """
 
+    # IPO window status -> volatility -> probability multiplier
+    MARKET_WINDOW_MULTIPLIERS = {
+        "open": {"low": 1.2, "medium": 1.0, "high": 0.7},
+        "mixed": {"low": 1.0, "medium": 0.8, "high": 0.5},
+        "closed": {"low": 0.6, "medium": 0.4, "high": 0.2},
+    }
+
     def __init__(self, config: Config = Config()):
         self.config = config
 
     def predict_ipo_timing(
-        self, company: Company, market_conditions: Dict = None
+        self,
+        company: Company,
+        market_conditions: Dict = None,
+        now: Optional[datetime] = None,
     ) -> Catalyst:
         """
         Predict IPO timing based on leading indicators
@@ -36,13 +97,17 @@ class TimingPredictionEngine:
         3. Revenue scale ($100M+ ARR)
         4. Market window health
         """
-        market_conditions = market_conditions or {"ipo_window": "open", "volatility": "low"}
+        now = now or datetime.now()
+        market_conditions = market_conditions or _DEFAULT_MARKET_CONDITIONS
+
+        # CFO hires, found once and shared by the CFO-based helpers
+        cfo_hires = [hire for hire in company.executive_hires if _is_cfo_role(hire.role)]
 
         # Base probability from funding stage
         funding_stage_prob = self._funding_stage_probability(company)
 
         # CFO/CCO hire signal (strongest predictor)
-        cfo_signal_prob = self._cfo_hire_signal(company)
+        cfo_signal_prob = self._cfo_hire_signal(cfo_hires, now)
 
         # Revenue scale readiness
         revenue_readiness = self._revenue_readiness(company)
@@ -55,10 +120,10 @@ class TimingPredictionEngine:
         adjusted_prob = base_prob * market_multiplier
 
         # Estimate date
-        estimated_date = self._estimate_ipo_date(company)
+        estimated_date = self._estimate_ipo_date(company, cfo_hires, now)
 
         # Calculate 6-month and 12-month probabilities
-        days_to_event = days_until(estimated_date)
+        days_to_event = (estimated_date - now).days
 
         if days_to_event < 180:  # Within 6 months
             prob_6mo = adjusted_prob
@@ -71,7 +136,7 @@ class TimingPredictionEngine:
             prob_12mo = adjusted_prob * 0.6
 
         # Identify leading indicators
-        leading_indicators = self._identify_ipo_indicators(company)
+        leading_indicators = self._identify_ipo_indicators(company, cfo_hires, now)
 
         # Risk factors
         risk_factors = self._identify_ipo_risks(company, market_conditions)
@@ -86,7 +151,9 @@ class TimingPredictionEngine:
             risk_factors=risk_factors,
         )
 
-    def predict_ma_timing(self, company: Company) -> Optional[Catalyst]:
+    def predict_ma_timing(
+        self, company: Company, now: Optional[datetime] = None
+    ) -> Optional[Catalyst]:
         """
         Predict M&A exit timing
 
@@ -97,10 +164,10 @@ class TimingPredictionEngine:
         - Funding runway
         """
         # Simple heuristic: companies with moderate funding, no IPO path
-        if company.total_funding < 100_000_000:
+        if company.total_funding < _MA_MIN_FUNDING:
             return None  # Too early
 
-        if company.total_funding > 500_000_000:
+        if company.total_funding > _MA_MAX_FUNDING:
             # More likely IPO path
             return None
 
@@ -108,12 +175,11 @@ class TimingPredictionEngine:
         ma_prob = 0.35  # Base probability for mid-stage companies
 
         # Sector with high M&A activity
-        high_ma_sectors = ["Cybersecurity", "Data_Infra", "Biotech_Infra"]
-        if company.sector.value in high_ma_sectors:
+        if company.sector in _HIGH_MA_SECTORS:
             ma_prob += 0.15
 
         # Estimate timing (12-24 months)
-        estimated_date = datetime.now() + timedelta(days=540)  # 18 months
+        estimated_date = (now or datetime.now()) + _EIGHTEEN_MONTHS
 
         return Catalyst(
             catalyst_type="M&A Exit Potential",
@@ -128,7 +194,9 @@ class TimingPredictionEngine:
             risk_factors=["Market multiples compression", "Antitrust scrutiny"],
         )
 
-    def predict_product_launch(self, company: Company) -> List[Catalyst]:
+    def predict_product_launch(
+        self, company: Company, now: Optional[datetime] = None
+    ) -> List[Catalyst]:
         """
         Predict major product launch timing
 
@@ -140,19 +208,19 @@ class TimingPredictionEngine:
             return catalysts
 
         # Recent patents → upcoming launches
-        six_months_ago = datetime.now() - timedelta(days=180)
+        six_months_ago = (now or datetime.now()) - _SIX_MONTHS
         recent_patents = [
             p for p in company.patent_grants if p.grant_date > six_months_ago
         ]
 
         if recent_patents:
             # Estimate launch 6 months from grant
-            avg_grant_date = sum(
-                (p.grant_date - datetime(1970, 1, 1)).days for p in recent_patents
-            ) / len(recent_patents)
-            avg_date = datetime(1970, 1, 1) + timedelta(days=avg_grant_date)
+            count = len(recent_patents)
+            ordinal_sum = sum(p.grant_date.toordinal() for p in recent_patents)
+            avg_grant_date = (ordinal_sum - count * _EPOCH_ORDINAL) / count
+            avg_date = _EPOCH + timedelta(days=avg_grant_date)
 
-            estimated_launch = avg_date + timedelta(days=180)
+            estimated_launch = avg_date + _SIX_MONTHS
 
             catalyst = Catalyst(
                 catalyst_type="Product Launch Expected",
@@ -172,7 +240,10 @@ class TimingPredictionEngine:
         return catalysts
 
     def predict_regulatory_approval(
-        self, company: Company, regulatory_context: Dict = None
+        self,
+        company: Company,
+        regulatory_context: Dict = None,
+        now: Optional[datetime] = None,
     ) -> Optional[Catalyst]:
         """
         Predict regulatory approval timing (FDA, FCC, etc.)
@@ -182,24 +253,18 @@ class TimingPredictionEngine:
         regulatory_context = regulatory_context or {}
 
         # Only relevant for certain sectors
-        regulated_sectors = {
-            "Biotech_Infra": {"agency": "FDA", "avg_timeline_days": 365},
-            "6G": {"agency": "FCC", "avg_timeline_days": 180},
-            "Green_Energy": {"agency": "DOE/FERC", "avg_timeline_days": 270},
-        }
+        sector_data = _REGULATED_SECTORS.get(company.sector)
 
-        if company.sector.value not in regulated_sectors:
+        if sector_data is None:
             return None
 
-        sector_data = regulated_sectors[company.sector.value]
-
         # Check if regulatory process is underway
         in_review = regulatory_context.get("in_regulatory_review", False)
 
         if not in_review:
             return None
 
-        estimated_date = datetime.now() + timedelta(
+        estimated_date = (now or datetime.now()) + timedelta(
             days=sector_data["avg_timeline_days"]
         )
 
@@ -217,45 +282,24 @@ class TimingPredictionEngine:
 
     def _funding_stage_probability(self, company: Company) -> float:
         """IPO probability based on funding stage"""
-        total_funding = company.total_funding
+        return _IPO_FUNDING_PROBS[bisect_left(_IPO_FUNDING_TIERS, company.total_funding)]
 
-        if total_funding > 1_000_000_000:  # $1B+ (unicorn+)
-            return 0.75
-        elif total_funding > 500_000_000:  # $500M+
-            return 0.60
-        elif total_funding > 300_000_000:  # $300M+
-            return 0.45
-        elif total_funding > 150_000_000:  # $150M+ (Series C/D)
-            return 0.25
-        else:
-            return 0.10
-
-    def _cfo_hire_signal(self, company: Company) -> float:
+    def _cfo_hire_signal(self, cfo_hires: List[ExecutiveHire], now: datetime) -> float:
         """CFO/CCO hire as IPO leading indicator (9-month lead time)"""
-        if not company.executive_hires:
+        if not cfo_hires:
             return 0.15
 
-        # Look for CFO or Chief Commercial Officer hires
-        nine_months_ago = datetime.now() - timedelta(days=270)
-        eighteen_months_ago = datetime.now() - timedelta(days=540)
-
-        recent_cfo = any(
-            hire.date > nine_months_ago
-            and hire.date < datetime.now()
-            and ("CFO" in hire.role.upper() or "CHIEF FINANCIAL" in hire.role.upper())
-            for hire in company.executive_hires
-        )
+        nine_months_ago = now - _NINE_MONTHS
+        eighteen_months_ago = now - _EIGHTEEN_MONTHS
 
-        if recent_cfo:
-            return 0.85  # Strong signal
+        earlier_cfo = False
+        for hire in cfo_hires:
+            if nine_months_ago < hire.date < now:
+                return 0.85  # Strong signal
 
-        # Check for earlier CFO hire (signal fading)
-        earlier_cfo = any(
-            hire.date > eighteen_months_ago
-            and hire.date < nine_months_ago
-            and ("CFO" in hire.role.upper() or "CHIEF FINANCIAL" in hire.role.upper())
-            for hire in company.executive_hires
-        )
+            # Earlier CFO hire (signal fading)
+            if eighteen_months_ago < hire.date < nine_months_ago:
+                earlier_cfo = True
 
         if earlier_cfo:
             return 0.60
@@ -271,81 +315,57 @@ class TimingPredictionEngine:
             else:
                 return 0.20
 
-        arr = company.estimated_arr
-
-        if arr > 500_000_000:  # $500M+ ARR
-            return 0.90
-        elif arr > 200_000_000:  # $200M+ ARR
-            return 0.75
-        elif arr > 100_000_000:  # $100M+ ARR (typical minimum)
-            return 0.60
-        elif arr > 50_000_000:  # $50M+ ARR
-            return 0.35
-        else:
-            return 0.15
+        return _IPO_ARR_READINESS[bisect_left(_IPO_ARR_TIERS, company.estimated_arr)]
 
     def _market_window_multiplier(self, market_conditions: Dict) -> float:
         """Adjust probability based on IPO market window health"""
         window_status = market_conditions.get("ipo_window", "open")
         volatility = market_conditions.get("volatility", "medium")
 
-        multipliers = {
-            "open": {"low": 1.2, "medium": 1.0, "high": 0.7},
-            "mixed": {"low": 1.0, "medium": 0.8, "high": 0.5},
-            "closed": {"low": 0.6, "medium": 0.4, "high": 0.2},
-        }
+        return self.MARKET_WINDOW_MULTIPLIERS.get(window_status, {}).get(volatility, 1.0)
 
-        return multipliers.get(window_status, {}).get(volatility, 1.0)
-
-    def _estimate_ipo_date(self, company: Company) -> datetime:
+    def _estimate_ipo_date(
+        self, company: Company, cfo_hires: List[ExecutiveHire], now: datetime
+    ) -> datetime:
         """Estimate IPO filing date"""
         # Default: 12 months from now
-        base_estimate = datetime.now() + timedelta(days=365)
+        base_estimate = now + _TWELVE_MONTHS
 
         # Adjust based on CFO hire
-        if company.executive_hires:
-            cfo_hires = [
-                hire
-                for hire in company.executive_hires
-                if "CFO" in hire.role.upper() or "CHIEF FINANCIAL" in hire.role.upper()
-            ]
-
-            if cfo_hires:
-                # Most recent CFO hire
-                latest_cfo = max(cfo_hires, key=lambda h: h.date)
+        if cfo_hires:
+            # Most recent CFO hire
+            latest_cfo_date = max(hire.date for hire in cfo_hires)
 
-                # IPO typically 9 months after CFO hire
-                cfo_based_estimate = latest_cfo.date + timedelta(days=270)
+            # IPO typically 9 months after CFO hire
+            cfo_based_estimate = latest_cfo_date + _NINE_MONTHS
 
-                # Use the nearer date
-                if cfo_based_estimate > datetime.now():
-                    return cfo_based_estimate
+            # Use the nearer date
+            if cfo_based_estimate > now:
+                return cfo_based_estimate
 
         # Adjust based on funding stage
         if company.total_funding > 1_000_000_000:
             # Unicorns typically IPO within 18 months if ready
-            base_estimate = datetime.now() + timedelta(days=540)
+            base_estimate = now + _EIGHTEEN_MONTHS
         elif company.total_funding > 500_000_000:
             # Late-stage: 12-24 months
-            base_estimate = datetime.now() + timedelta(days=450)
+            base_estimate = now + _FIFTEEN_MONTHS
         elif company.total_funding > 300_000_000:
             # Series D: 18-36 months
-            base_estimate = datetime.now() + timedelta(days=730)
+            base_estimate = now + _TWO_YEARS
 
         return base_estimate
 
-    def _identify_ipo_indicators(self, company: Company) -> List[str]:
+    def _identify_ipo_indicators(
+        self, company: Company, cfo_hires: List[ExecutiveHire], now: datetime
+    ) -> List[str]:
         """List leading indicators present for company"""
         indicators = []
 
         # CFO hire
-        if company.executive_hires:
-            recent_cfo = any(
-                "CFO" in hire.role.upper() or "CHIEF FINANCIAL" in hire.role.upper()
-                for hire in company.executive_hires
-                if hire.date > datetime.now() - timedelta(days=365)
-            )
-            if recent_cfo:
+        if cfo_hires:
+            twelve_months_ago = now - _TWELVE_MONTHS
+            if any(hire.date > twelve_months_ago for hire in cfo_hires):
                 indicators.append("CFO hire within last 12 months")
 
         # Revenue scale
@@ -388,8 +408,7 @@ class TimingPredictionEngine:
             risks.append("Revenue scale below typical IPO threshold")
 
         # Sector-specific
-        capex_heavy_sectors = ["Semiconductors", "Quantum", "6G", "Green_Energy"]
-        if company.sector.value in capex_heavy_sectors:
+        if company.sector in _CAPEX_HEAVY_SECTORS:
             risks.append("Capital-intensive business model (profitability scrutiny)")
 
         # Competitive
@@ -399,29 +418,40 @@ class TimingPredictionEngine:
         return risks
 
     def get_all_catalysts(
-        self, company: Company, market_conditions: Dict = None
+        self,
+        company: Company,
+        market_conditions: Dict = None,
+        now: Optional[datetime] = None,
     ) -> List[Catalyst]:
-        """Get all predicted catalysts for a company"""
+        """
+        Get all predicted catalysts for a company
+
+        Predictors are skipped when their own cheap eligibility checks
+        (funding window, patents, sector) already rule the company out.
+        """
+        now = now or datetime.now()
         catalysts = []
 
         # IPO timing (most important)
-        ipo_catalyst = self.predict_ipo_timing(company, market_conditions)
+        ipo_catalyst = self.predict_ipo_timing(company, market_conditions, now)
         if ipo_catalyst.confidence > 0.30:
             catalysts.append(ipo_catalyst)
 
         # M&A potential
-        ma_catalyst = self.predict_ma_timing(company)
-        if ma_catalyst:
-            catalysts.append(ma_catalyst)
+        if _MA_MIN_FUNDING <= company.total_funding <= _MA_MAX_FUNDING:
+            ma_catalyst = self.predict_ma_timing(company, now=now)
+            if ma_catalyst:
+                catalysts.append(ma_catalyst)
 
         # Product launches
-        product_catalysts = self.predict_product_launch(company)
-        catalysts.extend(product_catalysts)
+        if company.patent_grants:
+            catalysts.extend(self.predict_product_launch(company, now=now))
 
         # Regulatory approvals
-        reg_catalyst = self.predict_regulatory_approval(company)
-        if reg_catalyst:
-            catalysts.append(reg_catalyst)
+        if company.sector in _REGULATED_SECTORS:
+            reg_catalyst = self.predict_regulatory_approval(company, now=now)
+            if reg_catalyst:
+                catalysts.append(reg_catalyst)
 
         # Sort by estimated date
         catalysts.sort(key=lambda c: c.estimated_date)
@@ -429,10 +459,13 @@ class TimingPredictionEngine:
         return catalysts
 
     def get_next_catalyst(
-        self, company: Company, market_conditions: Dict = None
+        self,
+        company: Company,
+        market_conditions: Dict = None,
+        now: Optional[datetime] = None,
     ) -> Optional[Catalyst]:
         """Get the next imminent catalyst"""
-        catalysts = self.get_all_catalysts(company, market_conditions)
+        catalysts = self.get_all_catalysts(company, market_conditions, now)
 
         if not catalysts:
             return None
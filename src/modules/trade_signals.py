@@ -3,8 +3,12 @@ Tech Momentum Arbitrage Engine - Trade Signal Generator
 Generates actionable trade signals with multi-tier exposure recommendations
 """
 
+from bisect import bisect_right
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+import heapq
+from operator import attrgetter
+from typing import List, Dict, Iterable, Iterator, Optional
 from src.core.schemas import (
     Company,
     TradeSignal,
@@ -13,11 +17,79 @@ from src.core.schemas import (
     Catalyst,
     TradeRecommendation,
     DivergenceFlag,
+    Sector,
 )
 from src.core.config import Config
 from src.core.utils import calculate_position_size, time_to_catalyst
 
 
+# Fallback public proxies: sector ETFs
+_SECTOR_ETFS = {
+    Sector.AI_INFRA: "SKYY (Cloud Computing ETF) or WCLD",
+    Sector.SEMICONDUCTORS: "SMH (Semiconductor ETF) or SOXX",
+    Sector.CYBERSECURITY: "HACK (Cybersecurity ETF) or CIBR",
+    Sector.DATA_INFRA: "SKYY (Cloud Computing ETF)",
+    Sector.GREEN_ENERGY: "ICLN (Clean Energy ETF) or TAN (Solar)",
+    Sector.SIX_G: "ARKF (Fintech/Telecom) or IYZ (Telecom)",
+    Sector.QUANTUM: "QTUM (Quantum Computing ETF)",
+    Sector.BIOTECH_INFRA: "XBI (Biotech ETF) or IBB",
+}
+
+# Synthetic exposure: basket strategies for sectors
+_SYNTHETIC_BASKETS = {
+    Sector.AI_INFRA: "Custom basket: 40% NVDA, 30% AVGO, 20% ANET, 10% VRT (cooling exposure)",
+    Sector.SEMICONDUCTORS: "Custom basket: 30% ASML, 25% AMAT, 25% LRCX, 20% ENTG",
+    Sector.SIX_G: "Custom basket: 35% QRVO, 35% SWKS, 30% GLW",
+    Sector.CYBERSECURITY: "HACK ETF or custom basket: 25% PANW, 25% CRWD, 25% ZS, 25% FTNT",
+    Sector.GREEN_ENERGY: "Custom basket: 40% FLNC, 30% ENPH, 30% MP (rare earths)",
+}
+
+# Divergence flags bound once; enum member lookups on the class are slow
+# relative to the comparisons they feed
+_CONFIRMED_MOMENTUM = DivergenceFlag.CONFIRMED_MOMENTUM
+_MISPRICED_OPPORTUNITY = DivergenceFlag.MISPRICED_OPPORTUNITY
+_BUBBLE_RISK = DivergenceFlag.BUBBLE_RISK
+
+# Conviction adjustment per divergence flag
+_DIVERGENCE_ADJUSTMENTS = {
+    DivergenceFlag.CONFIRMED_MOMENTUM: 0.10,
+    DivergenceFlag.MISPRICED_OPPORTUNITY: 0.15,
+    DivergenceFlag.BUBBLE_RISK: -0.25,
+    DivergenceFlag.NO_SIGNAL: -0.10,
+}
+
+# Capital-intensive sectors (higher risk, high burn rate)
+_CAPEX_SECTORS = frozenset(
+    {Sector.SEMICONDUCTORS, Sector.QUANTUM, Sector.SIX_G, Sector.GREEN_ENERGY}
+)
+
+# Sector-specific risk factors
+_SECTOR_RISKS = {
+    Sector.QUANTUM: "Technology commercialization timeline uncertain",
+    Sector.BIOTECH_INFRA: "Regulatory approval timelines",
+}
+
+# Time horizon by days to the next catalyst: ascending "at least" boundaries,
+# where bisect_right counts the boundaries reached to index the horizon
+_HORIZON_DAYS = (180, 365, 730)
+_HORIZONS = (
+    "3-6 months (near-term catalyst)",
+    "6-12 months (medium-term)",
+    "12-24 months (long-term)",
+    "24+ months (very long-term)",
+)
+
+
+@lru_cache(maxsize=1024)
+def _catalyst_month(year: int, month: int) -> str:
+    """YYYY-MM label for a catalyst date, formatted once per month"""
+    return datetime(year, month, 1).strftime("%Y-%m")
+
+
+_CONVICTION = attrgetter("conviction")
+_CORRELATION_SCORE = attrgetter("correlation_score")
+
+
 class TradeSignalGenerator:
     """
     Generate trade signals with:
@@ -36,6 +108,7 @@ class TradeSignalGenerator:
         momentum_score: MomentumScore,
         moat_score: MoatScore,
         next_catalyst: Optional[Catalyst],
+        now: Optional[datetime] = None,
     ) -> TradeSignal:
         """
         Generate comprehensive trade signal for a company
@@ -46,16 +119,23 @@ class TradeSignalGenerator:
             momentum_score: Momentum score
             moat_score: Moat score
             next_catalyst: Next predicted catalyst
+            now: Generation time (defaults to now; batches pass one shared value)
 
         Returns:
             TradeSignal object
         """
+        now = now or datetime.now()
+
+        # Scores every helper reads, loaded once
+        flag = momentum_score.divergence_flag
+        momentum = momentum_score.momentum_score
+        moat = moat_score.total_moat_score
 
         # Determine recommendation
-        recommendation = self._generate_recommendation(momentum_score, moat_score)
+        recommendation = self._generate_recommendation(flag, momentum, moat)
 
         # Calculate conviction
-        conviction = self._calculate_conviction(momentum_score, moat_score, next_catalyst)
+        conviction = self._calculate_conviction(flag, momentum, moat, next_catalyst)
 
         # Identify exposure routes
         public_proxy = self._identify_public_proxy(company)
@@ -63,22 +143,22 @@ class TradeSignalGenerator:
         synthetic_exposure = self._generate_synthetic_exposure(company)
 
         # Position sizing
-        risk_level = self._assess_risk_level(company, moat_score)
+        risk_level = self._assess_risk_level(company, moat)
         position_size = calculate_position_size(conviction, risk_level)
 
         # Entry timing
-        entry_timing = self._determine_entry_timing(momentum_score, next_catalyst)
+        entry_timing = self._determine_entry_timing(flag, momentum, next_catalyst)
 
         # Risk factors
-        risk_factors = self._identify_risk_factors(company, momentum_score, moat_score)
+        risk_factors = self._identify_risk_factors(company, flag, moat)
 
         # Expected return (qualitative)
         expected_return = self._estimate_expected_return(
-            momentum_score, moat_score, next_catalyst
+            flag, momentum, moat, next_catalyst
         )
 
         # Time horizon
-        time_horizon = self._determine_time_horizon(next_catalyst)
+        time_horizon = self._determine_time_horizon(next_catalyst, now)
 
         return TradeSignal(
             rank=rank,
@@ -86,11 +166,11 @@ class TradeSignalGenerator:
             company_id=company.company_id,
             sector=company.sector,
             # Momentum metrics
-            momentum_score=momentum_score.momentum_score,
+            momentum_score=momentum,
             momentum_change_7d=momentum_score.momentum_change_7d,
             hype_score=momentum_score.hype_score,
             build_score=momentum_score.build_score,
-            moat_score=moat_score.total_moat_score,
+            moat_score=moat,
             # Exposure routes
             public_proxy=public_proxy,
             pre_ipo_access=pre_ipo_access,
@@ -107,7 +187,7 @@ class TradeSignalGenerator:
             risk_factors=risk_factors,
             expected_return=expected_return,
             time_horizon=time_horizon,
-            generated_date=datetime.now(),
+            generated_date=now,
         )
 
     def generate_signals(
@@ -116,6 +196,7 @@ class TradeSignalGenerator:
         momentum_scores: List[MomentumScore],
         moat_scores: List[MoatScore],
         catalysts: Dict[str, Catalyst],
+        top_n: Optional[int] = None,
     ) -> List[TradeSignal]:
         """
         Generate signals for multiple companies
@@ -125,13 +206,33 @@ class TradeSignalGenerator:
             momentum_scores: List of momentum scores (must be same order)
             moat_scores: List of moat scores (must be same order)
             catalysts: Dict mapping company_id to next catalyst
+            top_n: Only build the best N signals (partial selection, no full sort)
 
         Returns:
             List of TradeSignal objects, ranked by conviction
         """
         signals = []
 
-        for i, company in enumerate(companies):
+        # One generation time shared by the whole batch
+        now = datetime.now()
+
+        selected = range(len(companies))
+        if top_n is not None:
+            # Conviction alone decides the ranking, so select on it before
+            # building any signal
+            convictions = [
+                self._calculate_conviction(
+                    momentum_scores[i].divergence_flag,
+                    momentum_scores[i].momentum_score,
+                    moat_scores[i].total_moat_score,
+                    catalysts.get(company.company_id),
+                )
+                for i, company in enumerate(companies)
+            ]
+            selected = heapq.nlargest(top_n, selected, key=convictions.__getitem__)
+
+        for i in selected:
+            company = companies[i]
             momentum_score = momentum_scores[i]
             moat_score = moat_scores[i]
             next_catalyst = catalysts.get(company.company_id)
@@ -142,12 +243,14 @@ class TradeSignalGenerator:
                 momentum_score=momentum_score,
                 moat_score=moat_score,
                 next_catalyst=next_catalyst,
+                now=now,
             )
 
             signals.append(signal)
 
-        # Re-rank by conviction
-        signals.sort(key=lambda s: s.conviction, reverse=True)
+        # Re-rank by conviction (a top_n selection is already in order)
+        if top_n is None:
+            signals.sort(key=_CONVICTION, reverse=True)
 
         # Update ranks
         for i, signal in enumerate(signals):
@@ -156,34 +259,28 @@ class TradeSignalGenerator:
         return signals
 
     def _generate_recommendation(
-        self, momentum_score: MomentumScore, moat_score: MoatScore
+        self, flag: DivergenceFlag, momentum: float, moat: float
     ) -> TradeRecommendation:
         """Generate buy/sell recommendation"""
 
         # CONFIRMED_MOMENTUM + High Moat = STRONG BUY
-        if (
-            momentum_score.divergence_flag == DivergenceFlag.CONFIRMED_MOMENTUM
-            and moat_score.total_moat_score > 70
-        ):
+        if flag == _CONFIRMED_MOMENTUM and moat > 70:
             return TradeRecommendation.STRONG_BUY
 
         # MISPRICED_OPPORTUNITY (low hype, high build) = BUY
-        elif momentum_score.divergence_flag == DivergenceFlag.MISPRICED_OPPORTUNITY:
+        elif flag == _MISPRICED_OPPORTUNITY:
             return TradeRecommendation.BUY
 
         # High momentum, good moat = BUY
-        elif (
-            momentum_score.momentum_score > 75
-            and moat_score.total_moat_score > 55
-        ):
+        elif momentum > 75 and moat > 55:
             return TradeRecommendation.BUY
 
         # BUBBLE_RISK (high hype, low build) = FADE or SHORT
-        elif momentum_score.divergence_flag == DivergenceFlag.BUBBLE_RISK:
+        elif flag == _BUBBLE_RISK:
             return TradeRecommendation.FADE
 
         # Medium momentum = HOLD
-        elif momentum_score.momentum_score > 50:
+        elif momentum > 50:
             return TradeRecommendation.HOLD
 
         # Low momentum = SELL
@@ -192,17 +289,18 @@ class TradeSignalGenerator:
 
     def _calculate_conviction(
         self,
-        momentum_score: MomentumScore,
-        moat_score: MoatScore,
+        flag: DivergenceFlag,
+        momentum: float,
+        moat: float,
         next_catalyst: Optional[Catalyst],
     ) -> float:
         """Calculate conviction level (0-1)"""
 
         # Base conviction from momentum
-        momentum_conviction = momentum_score.momentum_score / 100
+        momentum_conviction = momentum / 100
 
         # Moat adjustment (±0.15)
-        moat_adjustment = (moat_score.total_moat_score - 50) / 500  # -0.10 to +0.10
+        moat_adjustment = (moat - 50) / 500  # -0.10 to +0.10
 
         # Catalyst proximity boost
         catalyst_boost = 0.0
@@ -210,14 +308,7 @@ class TradeSignalGenerator:
             catalyst_boost = 0.10
 
         # Divergence flag adjustment
-        divergence_adjustments = {
-            DivergenceFlag.CONFIRMED_MOMENTUM: 0.10,
-            DivergenceFlag.MISPRICED_OPPORTUNITY: 0.15,
-            DivergenceFlag.BUBBLE_RISK: -0.25,
-            DivergenceFlag.NO_SIGNAL: -0.10,
-        }
-
-        divergence_adj = divergence_adjustments.get(momentum_score.divergence_flag, 0)
+        divergence_adj = _DIVERGENCE_ADJUSTMENTS.get(flag, 0)
 
         # Combined conviction
         conviction = (
@@ -230,22 +321,11 @@ class TradeSignalGenerator:
         """Identify public market proxy exposure"""
         if company.public_proxies:
             # Return the highest correlation proxy
-            best_proxy = max(company.public_proxies, key=lambda p: p.correlation_score)
+            best_proxy = max(company.public_proxies, key=_CORRELATION_SCORE)
             return f"{best_proxy.ticker} ({best_proxy.exposure_type}, correlation {best_proxy.correlation_score:.2f})"
 
         # Fallback: sector ETFs
-        sector_etfs = {
-            "AI_Infra": "SKYY (Cloud Computing ETF) or WCLD",
-            "Semiconductors": "SMH (Semiconductor ETF) or SOXX",
-            "Cybersecurity": "HACK (Cybersecurity ETF) or CIBR",
-            "Data_Infra": "SKYY (Cloud Computing ETF)",
-            "Green_Energy": "ICLN (Clean Energy ETF) or TAN (Solar)",
-            "6G": "ARKF (Fintech/Telecom) or IYZ (Telecom)",
-            "Quantum": "QTUM (Quantum Computing ETF)",
-            "Biotech_Infra": "XBI (Biotech ETF) or IBB",
-        }
-
-        return sector_etfs.get(company.sector.value, "QQQ (Nasdaq-100)")
+        return _SECTOR_ETFS.get(company.sector, "QQQ (Nasdaq-100)")
 
     def _identify_pre_ipo_access(self, company: Company) -> Optional[str]:
         """Identify pre-IPO access routes"""
@@ -264,61 +344,51 @@ class TradeSignalGenerator:
         """Generate synthetic exposure strategy"""
 
         # Basket strategies for sectors
-        if company.sector.value == "AI_Infra":
-            return "Custom basket: 40% NVDA, 30% AVGO, 20% ANET, 10% VRT (cooling exposure)"
-        elif company.sector.value == "Semiconductors":
-            return "Custom basket: 30% ASML, 25% AMAT, 25% LRCX, 20% ENTG"
-        elif company.sector.value == "6G":
-            return "Custom basket: 35% QRVO, 35% SWKS, 30% GLW"
-        elif company.sector.value == "Cybersecurity":
-            return "HACK ETF or custom basket: 25% PANW, 25% CRWD, 25% ZS, 25% FTNT"
-        elif company.sector.value == "Green_Energy":
-            return "Custom basket: 40% FLNC, 30% ENPH, 30% MP (rare earths)"
-        else:
-            return "QQQ call spreads (tech proxy)"
+        return _SYNTHETIC_BASKETS.get(company.sector, "QQQ call spreads (tech proxy)")
 
     def _determine_entry_timing(
-        self, momentum_score: MomentumScore, next_catalyst: Optional[Catalyst]
+        self, flag: DivergenceFlag, momentum: float, next_catalyst: Optional[Catalyst]
     ) -> str:
         """Determine optimal entry timing"""
 
         # High momentum + near-term catalyst = Immediate
-        if momentum_score.momentum_score > 75 and next_catalyst:
+        if momentum > 75 and next_catalyst:
             if next_catalyst.probability_6mo > 0.50:
                 return "Immediate (catalyst within 6 months)"
 
         # Mispriced opportunity = Immediate
-        if momentum_score.divergence_flag == DivergenceFlag.MISPRICED_OPPORTUNITY:
+        if flag == _MISPRICED_OPPORTUNITY:
             return "Immediate (mispriced execution momentum)"
 
         # High momentum = Immediate
-        if momentum_score.momentum_score > 75:
+        if momentum > 75:
             return "Immediate"
 
         # Medium momentum = Staged entry
-        if momentum_score.momentum_score > 55:
+        if momentum > 55:
             return "Staged entry (build position over 30-60 days)"
 
         # Lower momentum = Wait for catalyst
         if next_catalyst:
-            return f"Wait for catalyst (monitor until {next_catalyst.estimated_date.strftime('%Y-%m')})"
+            estimated_date = next_catalyst.estimated_date
+            month = _catalyst_month(estimated_date.year, estimated_date.month)
+            return f"Wait for catalyst (monitor until {month})"
 
         return "Monitor (no immediate entry)"
 
-    def _assess_risk_level(self, company: Company, moat_score: MoatScore) -> str:
+    def _assess_risk_level(self, company: Company, moat: float) -> str:
         """Assess risk level"""
 
         # High moat = Lower risk
-        if moat_score.total_moat_score > 70:
+        if moat > 70:
             return "Low"
 
         # Medium moat + late stage = Medium risk
-        if moat_score.total_moat_score > 50 and company.total_funding > 300_000_000:
+        if moat > 50 and company.total_funding > 300_000_000:
             return "Medium"
 
         # CapEx heavy sectors = Higher risk
-        capex_sectors = ["Semiconductors", "Quantum", "6G", "Green_Energy"]
-        if company.sector.value in capex_sectors:
+        if company.sector in _CAPEX_SECTORS:
             return "High"
 
         # Early stage = High risk
@@ -328,20 +398,17 @@ class TradeSignalGenerator:
         return "Medium"
 
     def _identify_risk_factors(
-        self,
-        company: Company,
-        momentum_score: MomentumScore,
-        moat_score: MoatScore,
+        self, company: Company, flag: DivergenceFlag, moat: float
     ) -> List[str]:
         """Identify key risk factors"""
         risks = []
 
         # Bubble risk
-        if momentum_score.divergence_flag == DivergenceFlag.BUBBLE_RISK:
+        if flag == _BUBBLE_RISK:
             risks.append("Bubble risk: High hype relative to execution")
 
         # Low moat
-        if moat_score.total_moat_score < 40:
+        if moat < 40:
             risks.append("Weak competitive moat (susceptible to competition)")
 
         # Customer concentration
@@ -353,8 +420,7 @@ class TradeSignalGenerator:
             risks.append("Requires additional funding rounds (dilution risk)")
 
         # CapEx intensity
-        capex_sectors = ["Semiconductors", "Quantum", "6G", "Green_Energy"]
-        if company.sector.value in capex_sectors:
+        if company.sector in _CAPEX_SECTORS:
             risks.append("Capital-intensive model (high burn rate)")
 
         # Market timing
@@ -362,61 +428,56 @@ class TradeSignalGenerator:
             risks.append("IPO window dependency (market conditions)")
 
         # Sector-specific
-        if company.sector.value == "Quantum":
-            risks.append("Technology commercialization timeline uncertain")
-        elif company.sector.value == "Biotech_Infra":
-            risks.append("Regulatory approval timelines")
+        sector_risk = _SECTOR_RISKS.get(company.sector)
+        if sector_risk:
+            risks.append(sector_risk)
 
         return risks
 
     def _estimate_expected_return(
         self,
-        momentum_score: MomentumScore,
-        moat_score: MoatScore,
+        flag: DivergenceFlag,
+        momentum: float,
+        moat: float,
         next_catalyst: Optional[Catalyst],
     ) -> str:
         """Estimate expected return (qualitative)"""
 
         # Very high conviction = High return potential
         if (
-            momentum_score.momentum_score > 85
-            and moat_score.total_moat_score > 70
+            momentum > 85
+            and moat > 70
             and next_catalyst
             and next_catalyst.probability_6mo > 0.60
         ):
             return "50-100% (12-18 months)"
 
         # High momentum + catalyst = Good return
-        if momentum_score.momentum_score > 75 and next_catalyst:
+        if momentum > 75 and next_catalyst:
             return "30-60% (12 months)"
 
         # Mispriced opportunity = Asymmetric
-        if momentum_score.divergence_flag == DivergenceFlag.MISPRICED_OPPORTUNITY:
+        if flag == _MISPRICED_OPPORTUNITY:
             return "40-80% (18-24 months, mispricing corrects)"
 
         # Moderate momentum = Moderate return
-        if momentum_score.momentum_score > 60:
+        if momentum > 60:
             return "20-40% (12-18 months)"
 
         # Lower conviction = Lower return
         return "10-25% (18-24 months)"
 
-    def _determine_time_horizon(self, next_catalyst: Optional[Catalyst]) -> str:
+    def _determine_time_horizon(
+        self, next_catalyst: Optional[Catalyst], now: datetime
+    ) -> str:
         """Determine investment time horizon"""
 
         if not next_catalyst:
             return "18-36 months (long-term hold)"
 
-        days = (next_catalyst.estimated_date - datetime.now()).days
+        days = (next_catalyst.estimated_date - now).days
 
-        if days < 180:
-            return "3-6 months (near-term catalyst)"
-        elif days < 365:
-            return "6-12 months (medium-term)"
-        elif days < 730:
-            return "12-24 months (long-term)"
-        else:
-            return "24+ months (very long-term)"
+        return _HORIZONS[bisect_right(_HORIZON_DAYS, days)]
 
     def filter_high_conviction(
         self, signals: List[TradeSignal], threshold: float = 0.70
@@ -429,3 +490,15 @@ class TradeSignalGenerator:
     ) -> List[TradeSignal]:
         """Filter by recommendation type"""
         return [s for s in signals if s.recommendation == recommendation]
+
+    def iter_high_conviction(
+        self, signals: Iterable[TradeSignal], threshold: float = 0.70
+    ) -> Iterator[TradeSignal]:
+        """Lazily yield high-conviction signals (for streaming/paginated consumers)"""
+        return (s for s in signals if s.conviction >= threshold)
+
+    def iter_by_recommendation(
+        self, signals: Iterable[TradeSignal], recommendation: TradeRecommendation
+    ) -> Iterator[TradeSignal]:
+        """Lazily yield signals with the given recommendation"""
+        return (s for s in signals if s.recommendation == recommendation)
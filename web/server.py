@@ -5,17 +5,151 @@ Run with: python3 server.py
 Access at: http://localhost:8000
 """
 
+from collections import OrderedDict
+import datetime
+import email.utils
+import gzip
 import http.server
-import socketserver
 import os
+import stat
+import threading
+import urllib.parse
 
 PORT = 8000
 DIRECTORY = os.path.dirname(os.path.abspath(__file__))
 
+# Static files up to this size are served from memory, at most this many at once
+MAX_CACHED_FILE_SIZE = 1024 * 1024
+MAX_CACHED_FILES = 16
+
+# path -> (mtime_ns, raw bytes, gzipped bytes), least recently used first
+_static_cache = OrderedDict()
+_static_cache_lock = threading.Lock()
+
+
+def load_static_file(path, mtime_ns):
+    """Return (raw bytes, gzipped bytes) for a file, re-reading it when it changes"""
+    with _static_cache_lock:
+        cached = _static_cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            _static_cache.move_to_end(path)
+            return cached[1], cached[2]
+
+    with open(path, 'rb') as f:
+        content = f.read()
+    gzipped = gzip.compress(content)
+
+    with _static_cache_lock:
+        # One entry per path: an edited file replaces its old bytes
+        _static_cache[path] = (mtime_ns, content, gzipped)
+        _static_cache.move_to_end(path)
+        while len(_static_cache) > MAX_CACHED_FILES:
+            _static_cache.popitem(last=False)
+    return content, gzipped
+
+
+def accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding header allows gzip, honouring q=0"""
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIRECTORY, **kwargs)
 
+    # Directory index files, in the order send_head looks for them
+    index_pages = ('index.html', 'index.htm')
+
+    def do_GET(self):
+        body = self.send_cached_head()
+        if body is None:
+            return super().do_GET()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        if self.send_cached_head() is None:
+            return super().do_HEAD()
+
+    def send_cached_head(self):
+        """
+        Send headers for a small static file served from memory
+
+        Returns the body to write (empty for a 304), or None when nothing was
+        sent and the stock handler should serve the request instead.
+        """
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            # Let the stock handler redirect '/dir' to '/dir/' or list the directory
+            if not urllib.parse.urlsplit(self.path).path.endswith('/'):
+                return None
+            for index in self.index_pages:
+                index = os.path.join(path, index)
+                if os.path.isfile(index):
+                    path = index
+                    break
+            else:
+                return None
+
+        # Redirects, 404s, vanished files and large files take the stock path
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode) or st.st_size > MAX_CACHED_FILE_SIZE:
+            return None
+
+        if self.not_modified_since(st.st_mtime):
+            self.send_response(304)
+            self.end_headers()
+            return b''
+
+        try:
+            content, gzipped = load_static_file(path, st.st_mtime_ns)
+        except OSError:
+            return None
+
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(path))
+        if accepts_gzip(self.headers.get('Accept-Encoding', '')):
+            content = gzipped
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Last-Modified', self.date_time_string(st.st_mtime))
+        self.send_header('Cache-Control', 'public, max-age=300')
+        self.end_headers()
+        return content
+
+    def not_modified_since(self, mtime):
+        """Conditional GET check, as SimpleHTTPRequestHandler.send_head does it"""
+        if 'If-Modified-Since' not in self.headers or 'If-None-Match' in self.headers:
+            return False
+        try:
+            ims = email.utils.parsedate_to_datetime(self.headers['If-Modified-Since'])
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if ims.tzinfo is None:
+            ims = ims.replace(tzinfo=datetime.timezone.utc)
+        if ims.tzinfo is not datetime.timezone.utc:
+            return False
+        last_modified = datetime.datetime.fromtimestamp(mtime, datetime.timezone.utc)
+        return last_modified.replace(microsecond=0) <= ims
+
     def end_headers(self):
         # Add CORS headers
         self.send_header('Access-Control-Allow-Origin', '*')
@@ -24,7 +158,8 @@ class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         super().end_headers()
 
 if __name__ == '__main__':
-    with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
+    # One thread per connection, so a slow client does not block the others
+    with http.server.ThreadingHTTPServer(("", PORT), MyHTTPRequestHandler) as httpd:
         print("=" * 80)
         print("TECH MOMENTUM ARBITRAGE ENGINE - FRONTEND SERVER")
         print("=" * 80)